@@ -579,11 +579,18 @@ def get_conversation_themes(
     # Extract user messages
     message_history = [msg.content for msg in messages if msg.is_from_user]
     
-    # Create a temporary conversation memory service for this conversation only
-    memory_service = ConversationMemoryService(db=db, user=current_user)
+    # Use the same TF-IDF based approach as get_recent_themes, with a
+    # vectorizer fitted to this conversation only; the memory service's
+    # hashing vectorizer is shared and has no vocabulary to report
+    from sklearn.feature_extraction.text import TfidfVectorizer
     
-    # Use the same TF-IDF based approach from get_recent_themes but on this conversation only
-    vectorizer = memory_service.vectorizer
+    vectorizer = TfidfVectorizer(
+        lowercase=True,
+        stop_words="english",
+        min_df=0.0,
+        max_df=1.0,
+        ngram_range=(1, 2),
+    )
     
     # Join all user messages
     user_messages = " ".join(message_history)
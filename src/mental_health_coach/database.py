@@ -8,8 +8,10 @@ import logging
 from typing import Generator
 import sqlite3
 
-from sqlalchemy import create_engine, inspect, MetaData, Table, Column, Boolean, Text, text
+from sqlalchemy import create_engine, event, inspect, MetaData, Table, Column, Boolean, Text, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import StaticPool
 
 from dotenv import load_dotenv
 
@@ -29,11 +31,96 @@ DATABASE_PATH = DATABASE_URL.replace("sqlite:///", "")
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
+# URLs that name a private in-memory SQLite database rather than a file
+_SQLITE_MEMORY_URLS = ("sqlite://", "sqlite:///:memory:")
+
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment.
+    
+    Args:
+        name: Name of the environment variable.
+        default: Value to use when the variable is not set.
+        
+    Returns:
+        The parsed boolean value.
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Configure each new SQLite connection for schema maintenance.
+    
+    WAL journaling with ``synchronous=NORMAL`` needs a single fsync per
+    commit and lets readers proceed while a write is in progress.
+    Foreign key enforcement is also switched on for the connection.
+    
+    Args:
+        dbapi_connection: Raw DB-API connection that was just opened.
+        connection_record: Pool record for the connection (unused).
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def make_engine(database_url: str = DATABASE_URL) -> Engine:
+    """Create a pooled SQLAlchemy engine configured from the environment.
+    
+    Pool behaviour is controlled by ``POOL_SIZE``, ``POOL_MAX_OVERFLOW``,
+    ``POOL_TIMEOUT``, ``POOL_RECYCLE``, ``POOL_PRE_PING`` and ``POOL_USE_LIFO``.
+    In-memory SQLite databases use a StaticPool instead: the one connection
+    holds the database, so every session and thread sees the same data.
+    
+    Args:
+        database_url: Database URL to connect to.
+        
+    Returns:
+        A configured SQLAlchemy engine.
+    """
+    if not database_url.startswith("sqlite"):
+        connect_args = {}
+    else:
+        connect_args = {"check_same_thread": False}
+        if database_url in _SQLITE_MEMORY_URLS:
+            return create_engine(
+                database_url, connect_args=connect_args, poolclass=StaticPool
+            )
+    
+    return create_engine(
+        database_url,
+        connect_args=connect_args,
+        pool_size=int(os.getenv("POOL_SIZE", "5")),
+        max_overflow=int(os.getenv("POOL_MAX_OVERFLOW", "10")),
+        pool_timeout=int(os.getenv("POOL_TIMEOUT", "30")),
+        pool_recycle=int(os.getenv("POOL_RECYCLE", "1800")),
+        pool_pre_ping=_env_bool("POOL_PRE_PING", True),
+        pool_use_lifo=_env_bool("POOL_USE_LIFO", False),
+    )
+
+
+def use_maintenance_pragmas(target: Engine) -> None:
+    """Set the maintenance pragmas on every new SQLite connection of an engine.
+    
+    Meant for the maintenance scripts only. The application's connections
+    keep SQLite's defaults; in particular foreign keys stay unenforced.
+    Engines for other dialects are left unchanged.
+    
+    Args:
+        target: Engine whose connections should be configured.
+    """
+    if target.dialect.name == "sqlite":
+        event.listen(target, "connect", _set_sqlite_pragmas)
+
+
 # Create SQLAlchemy engine
-engine = create_engine(
-    DATABASE_URL, 
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-)
+engine = make_engine()
 
 # Create sessionmaker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -62,6 +149,9 @@ def check_and_update_schema() -> None:
     
     inspector = inspect(engine)
     
+    # One timestamp per run, shared by every updated_at default below
+    now = datetime.utcnow().isoformat()
+    
     # Check users table
     if 'users' in inspector.get_table_names():
         columns = [col['name'] for col in inspector.get_columns('users')]
@@ -92,7 +182,7 @@ def check_and_update_schema() -> None:
         if 'updated_at' not in columns:
             logger.info("Adding missing 'updated_at' column to messages table")
             with engine.connect() as conn:
-                conn.execute(text(f"ALTER TABLE messages ADD COLUMN updated_at TIMESTAMP DEFAULT '{datetime.utcnow().isoformat()}'"))
+                conn.execute(text(f"ALTER TABLE messages ADD COLUMN updated_at TIMESTAMP DEFAULT '{now}'"))
                 conn.commit()
             logger.info("Successfully added 'updated_at' column to messages")
     
@@ -102,7 +192,7 @@ def check_and_update_schema() -> None:
         if 'updated_at' not in columns:
             logger.info("Adding missing 'updated_at' column to conversations table")
             with engine.connect() as conn:
-                conn.execute(text(f"ALTER TABLE conversations ADD COLUMN updated_at TIMESTAMP DEFAULT '{datetime.utcnow().isoformat()}'"))
+                conn.execute(text(f"ALTER TABLE conversations ADD COLUMN updated_at TIMESTAMP DEFAULT '{now}'"))
                 conn.commit()
             logger.info("Successfully added 'updated_at' column to conversations")
     
@@ -120,7 +210,7 @@ def check_and_update_schema() -> None:
         if 'updated_at' not in columns:
             logger.info("Adding missing 'updated_at' column to important_memories table")
             with engine.connect() as conn:
-                conn.execute(text(f"ALTER TABLE important_memories ADD COLUMN updated_at TIMESTAMP DEFAULT '{datetime.utcnow().isoformat()}'"))
+                conn.execute(text(f"ALTER TABLE important_memories ADD COLUMN updated_at TIMESTAMP DEFAULT '{now}'"))
                 conn.commit()
             logger.info("Successfully added 'updated_at' column to important_memories")
     
@@ -130,7 +220,7 @@ def check_and_update_schema() -> None:
         if 'updated_at' not in columns:
             logger.info("Adding missing 'updated_at' column to assessments table")
             with engine.connect() as conn:
-                conn.execute(text(f"ALTER TABLE assessments ADD COLUMN updated_at TIMESTAMP DEFAULT '{datetime.utcnow().isoformat()}'"))
+                conn.execute(text(f"ALTER TABLE assessments ADD COLUMN updated_at TIMESTAMP DEFAULT '{now}'"))
                 conn.commit()
             logger.info("Successfully added 'updated_at' column to assessments")
 
@@ -141,7 +231,10 @@ def apply_migrations() -> None:
         # Only import here to avoid circular imports
         from src.mental_health_coach.utils.migrations import apply_migrations as run_migrations
         
-        if DATABASE_URL.startswith("sqlite"):
+        if DATABASE_URL in _SQLITE_MEMORY_URLS:
+            # Nothing to migrate: create_all has just built the current schema
+            logger.info("Skipping migrations for in-memory SQLite database")
+        elif DATABASE_URL.startswith("sqlite"):
             # Extract file path from SQLite URL
             db_path = DATABASE_URL.replace("sqlite:///", "")
             if db_path.startswith("./"):
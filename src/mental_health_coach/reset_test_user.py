@@ -1,7 +1,7 @@
 """Reset test user password."""
 
 from sqlalchemy import create_engine, text
-from src.mental_health_coach.auth.security import get_password_hash
+from src.mental_health_coach.utils.db_fix_all import TEST_USER_HASH
 import os
 from dotenv import load_dotenv
 
@@ -10,14 +10,11 @@ load_dotenv()
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///mental_health_coach.db")
 engine = create_engine(DATABASE_URL)
 
-# Reset password
-hashed_password = get_password_hash("testpassword123")
-
 with engine.connect() as conn:
     conn.execute(text("""
         UPDATE users 
         SET hashed_password = :password, is_verified = 1 
         WHERE email = 'test@example.com'
-    """), {"password": hashed_password})
+    """), {"password": TEST_USER_HASH})
     conn.commit()
     print("Test user password reset to: testpassword123") 
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""Bounded cache of hashed term-count rows for conversation chunks."""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+
+def chunk_key(user_id: int, chunk: str) -> Hashable:
+    """Build a cache key for one of a user's conversation chunks.
+    
+    Args:
+        user_id: ID of the user the chunk belongs to.
+        chunk: Text of the chunk.
+    
+    Returns:
+        Hashable: The key, stable for identical chunk text.
+    """
+    digest = hashlib.blake2b(chunk.encode("utf-8"), digest_size=16).hexdigest()
+    return (user_id, digest)
+
+
+class ChunkEmbeddingCache:
+    """Thread-safe LRU cache of embedded chunks.
+    
+    Conversation chunks rarely change once written, so their term-count rows
+    are kept between requests and only new chunks need to be tokenized. The
+    least recently used rows are evicted once ``max_entries`` is reached.
+    """
+    
+    def __init__(self, max_entries: int = 10000) -> None:
+        """Initialize an empty cache.
+        
+        Args:
+            max_entries: Maximum number of rows to keep.
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._rows: "OrderedDict[Hashable, Any]" = OrderedDict()
+    
+    def get_many(self, keys: Sequence[Hashable]) -> List[Optional[Any]]:
+        """Look up several rows at once.
+        
+        Args:
+            keys: Keys from ``chunk_key``.
+        
+        Returns:
+            List[Optional[Any]]: The cached row for each key, or None on a miss.
+        """
+        with self._lock:
+            rows = []
+            for key in keys:
+                row = self._rows.get(key)
+                if row is not None:
+                    self._rows.move_to_end(key)
+                rows.append(row)
+            return rows
+    
+    def set_many(self, rows: Dict[Hashable, Any]) -> None:
+        """Store several rows at once, evicting the oldest if full.
+        
+        Args:
+            rows: Mapping of keys from ``chunk_key`` to rows.
+        """
+        with self._lock:
+            for key, row in rows.items():
+                self._rows[key] = row
+                self._rows.move_to_end(key)
+            while len(self._rows) > self.max_entries:
+                self._rows.popitem(last=False)
+    
+    def __len__(self) -> int:
+        """Return the number of cached rows."""
+        with self._lock:
+            return len(self._rows)
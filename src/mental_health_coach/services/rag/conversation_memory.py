@@ -4,15 +4,89 @@ This module provides a Retrieval Augmented Generation (RAG) system
 to efficiently store and retrieve relevant parts of conversation history.
 """
 
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple
 import datetime
+import heapq
+from functools import lru_cache
+from itertools import groupby, islice
+from operator import itemgetter
 from sqlalchemy.orm import Session
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
 from src.mental_health_coach.models.user import User
 from src.mental_health_coach.models.conversation import Conversation, Message, ImportantMemory
+from src.mental_health_coach.services.rag._cache import ChunkEmbeddingCache, chunk_key
+
+# Hashed chunk rows shared by every service in the process
+_chunk_cache = ChunkEmbeddingCache()
+
+
+def _re2_tokenizer() -> Optional[Callable[[str], List[str]]]:
+    """Build a tokenizer on the linear-time re2 engine, if it is installed.
+    
+    Returns:
+        Optional[Callable[[str], List[str]]]: The tokenizer, or None to use
+            scikit-learn's default regex tokenizer.
+    """
+    try:
+        import re2
+    except ImportError:
+        return None
+    
+    # The same tokens as scikit-learn's default (?u)\b\w\w+\b: runs of two
+    # or more letters, digits or underscores
+    return re2.compile(r"[\pL\pN_]{2,}").findall
+
+
+@lru_cache(maxsize=1)
+def _get_vectorizer() -> Any:
+    """Get the hashing vectorizer shared by every service in the process.
+    
+    The vectorizer holds no fitted state, so one instance can serve all
+    services and threads; only the IDF weights are fitted per corpus.
+    
+    Returns:
+        HashingVectorizer: Vectorizer that turns text into term counts.
+    """
+    from sklearn.feature_extraction.text import HashingVectorizer
+    
+    tokenizer = _re2_tokenizer()
+    
+    # Hash terms straight to columns instead of building a vocabulary on
+    # every index
+    return HashingVectorizer(
+        lowercase=True,
+        stop_words="english",
+        tokenizer=tokenizer,
+        token_pattern=None if tokenizer else r"(?u)\b\w\w+\b",
+        ngram_range=(1, 2),  # Include both unigrams and bigrams for better matching
+        n_features=2**18,
+        alternate_sign=False,
+        norm=None,
+        # Single precision is plenty for ranking and halves the bytes the
+        # similarity product and the chunk cache have to hold
+        dtype=np.float32,
+    )
+
+
+def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Find the indices of the highest scores, best first.
+    
+    Partitions out the top k in linear time and sorts only those, rather
+    than sorting every score.
+    
+    Args:
+        scores: One-dimensional array of scores.
+        k: Number of indices to return.
+        
+    Returns:
+        Indices of the k highest scores in descending score order.
+    """
+    if k < len(scores):
+        top = np.argpartition(-scores, k)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind="stable")]
 
 
 class ConversationMemoryService:
@@ -25,26 +99,29 @@ class ConversationMemoryService:
     Attributes:
         db: Database session.
         user: User to manage conversation memory for.
-        vectorizer: TF-IDF vectorizer for text embedding.
+        vectorizer: Hashing vectorizer that turns text into term counts.
+        transformer: TF-IDF weighting fitted to the user's conversations.
+        cache: Cache of hashed term counts for conversation chunks.
     """
     
-    def __init__(self, db: Session, user: User) -> None:
+    def __init__(
+        self, db: Session, user: User, cache: Optional[ChunkEmbeddingCache] = None
+    ) -> None:
         """Initialize the conversation memory service.
         
         Args:
             db: Database session.
             user: User to manage conversation memory for.
+            cache: Optional chunk cache; defaults to the one shared by the process.
         """
+        # scikit-learn is slow to import, so load it only once a service is used
+        from sklearn.feature_extraction.text import TfidfTransformer
+        
         self.db = db
         self.user = user
-        # Initialize vectorizer with more flexible parameters to handle edge cases
-        self.vectorizer = TfidfVectorizer(
-            lowercase=True,
-            stop_words="english",
-            min_df=0.0,  # Allow terms that appear in any document (was 1)
-            max_df=1.0,  # Allow terms that appear in all documents (was 0.9)
-            ngram_range=(1, 2)  # Include both unigrams and bigrams for better matching
-        )
+        self.vectorizer = _get_vectorizer()
+        self.transformer = TfidfTransformer()
+        self.cache = cache if cache is not None else _chunk_cache
         
     def index_conversations(self) -> Tuple[List[str], List[Dict[str, Any]], np.ndarray]:
         """Index all conversations for the user for efficient retrieval.
@@ -58,60 +135,92 @@ class ConversationMemoryService:
                 - List of metadata for each chunk
                 - Matrix of TF-IDF vector embeddings for each chunk
         """
-        # Get all conversations for the user
-        conversations = (
-            self.db.query(Conversation)
-            .filter(Conversation.user_id == self.user.id)
-            .order_by(Conversation.started_at.asc())
-            .all()
-        )
-        
         # Process conversations into chunks for indexing
         chunks = []
         metadata = []
         
-        for conversation in conversations:
-            # Get messages for this conversation
-            messages = (
-                self.db.query(Message)
-                .filter(Message.conversation_id == conversation.id)
-                .order_by(Message.created_at.asc())
-                .all()
+        for chunk_text, chunk_metadata in self._iter_chunks():
+            chunks.append(chunk_text)
+            metadata.append(chunk_metadata)
+        
+        # Create vector embeddings
+        if not chunks:
+            return [], [], np.array([])
+            
+        vectors = self.transformer.fit_transform(self._chunk_counts(chunks))
+        
+        return chunks, metadata, vectors
+    
+    def _iter_chunks(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream the user's conversations as chunks of three messages.
+        
+        Messages are fetched from the database in batches, so only the
+        current chunk's messages are held rather than the whole history.
+        
+        Yields:
+            Tuple of the chunk text and its metadata.
+        """
+        # Get every message of the user's conversations in one query, grouped
+        # by conversation in chronological order
+        rows = (
+            self.db.query(Conversation, Message)
+            .join(Message, Message.conversation_id == Conversation.id)
+            .filter(Conversation.user_id == self.user.id)
+            .order_by(
+                Conversation.started_at.asc(),
+                Conversation.id.asc(),
+                Message.created_at.asc(),
             )
+            .yield_per(500)
+        )
+        
+        for conversation, conversation_rows in groupby(rows, key=itemgetter(0)):
+            messages = (message for _, message in conversation_rows)
             
             # Process conversation in chunks of 3 messages for better context
-            for i in range(0, len(messages), 3):
-                chunk_messages = messages[i:i+3]
-                
-                # Skip empty chunks
-                if not chunk_messages:
-                    continue
-                
+            while chunk_messages := list(islice(messages, 3)):
                 # Create chunk text
-                chunk_text = ""
-                for msg in chunk_messages:
-                    sender = "User" if msg.is_from_user else "Coach"
-                    chunk_text += f"{sender}: {msg.content}\n"
+                chunk_text = "".join(
+                    f"{'User' if msg.is_from_user else 'Coach'}: {msg.content}\n"
+                    for msg in chunk_messages
+                )
                 
-                # Add chunk and metadata
-                chunks.append(chunk_text)
-                metadata.append({
+                yield chunk_text, {
                     "conversation_id": conversation.id,
                     "conversation_title": conversation.title,
                     "is_formal_session": conversation.is_formal_session,
                     "session_number": conversation.session_number,
                     "date": conversation.started_at.strftime("%Y-%m-%d"),
-                    "first_message_id": chunk_messages[0].id if chunk_messages else None,
-                    "last_message_id": chunk_messages[-1].id if chunk_messages else None,
-                })
+                    "first_message_id": chunk_messages[0].id,
+                    "last_message_id": chunk_messages[-1].id,
+                }
+    
+    def _chunk_counts(self, chunks: List[str]) -> Any:
+        """Get the hashed term counts for conversation chunks.
         
-        # Create vector embeddings
-        if not chunks:
-            return [], [], np.array([])
+        Counts depend only on the chunk text, so rows for chunks seen before
+        come from the cache and only new chunks are tokenized.
+        
+        Args:
+            chunks: Conversation chunks as strings.
             
-        vectors = self.vectorizer.fit_transform(chunks)
+        Returns:
+            Sparse matrix with one row of term counts per chunk.
+        """
+        from scipy import sparse
         
-        return chunks, metadata, vectors
+        keys = [chunk_key(self.user.id, chunk) for chunk in chunks]
+        rows = self.cache.get_many(keys)
+        
+        missing = [i for i, row in enumerate(rows) if row is None]
+        if missing:
+            counts = self.vectorizer.transform([chunks[i] for i in missing])
+            fresh = {keys[i]: counts[j] for j, i in enumerate(missing)}
+            self.cache.set_many(fresh)
+            for i in missing:
+                rows[i] = fresh[keys[i]]
+        
+        return sparse.vstack(rows, format="csr")
     
     def store_important_memory(
         self, 
@@ -197,33 +306,55 @@ class ConversationMemoryService:
         Returns:
             List of dictionaries containing relevant chunks and their metadata.
         """
+        return self.retrieve_relevant_context_batch([query], max_results)[0]
+    
+    def retrieve_relevant_context_batch(
+        self, queries: List[str], max_results: int = 5
+    ) -> List[List[Dict[str, Any]]]:
+        """Retrieve the most relevant conversation chunks for several queries.
+        
+        The conversations are indexed once and every query is scored against
+        them in a single sparse matrix product.
+        
+        Args:
+            queries: The query texts to find relevant conversation history for.
+            max_results: Maximum number of results to return per query.
+            
+        Returns:
+            For each query, a list of dictionaries containing relevant chunks
+            and their metadata.
+        """
         # Index conversations
         chunks, metadata, vectors = self.index_conversations()
         
-        # If no conversations exist, return empty list
-        if not chunks:
-            return []
-        
-        # Vectorize the query
-        query_vector = self.vectorizer.transform([query])
+        # If no conversations exist, return empty lists
+        if not chunks or not queries:
+            return [[] for _ in queries]
         
-        # Calculate similarities
-        similarities = cosine_similarity(query_vector, vectors).flatten()
+        # Vectorize the queries
+        query_vectors = self.transformer.transform(self.vectorizer.transform(queries))
         
-        # Get top results
-        top_indices = similarities.argsort()[-max_results:][::-1]
+        # The TF-IDF rows are already L2-normalized, so cosine similarity is
+        # a single sparse product against the corpus, one column per query
+        similarities = (vectors @ query_vectors.T).toarray()
         
-        # Return results
-        results = []
-        for idx in top_indices:
-            if similarities[idx] > 0.1:  # Only include somewhat relevant results
-                results.append({
-                    "text": chunks[idx],
-                    "metadata": metadata[idx],
-                    "similarity_score": float(similarities[idx]),
-                })
+        batch_results = []
+        for column in similarities.T:
+            # Get top results
+            top_indices = _top_k_indices(column, max_results)
+            
+            # Collect results
+            results = []
+            for idx in top_indices:
+                if column[idx] > 0.1:  # Only include somewhat relevant results
+                    results.append({
+                        "text": chunks[idx],
+                        "metadata": metadata[idx],
+                        "similarity_score": float(column[idx]),
+                    })
+            batch_results.append(results)
         
-        return results
+        return batch_results
     
     def retrieve_therapeutic_timeline(self) -> List[Dict[str, Any]]:
         """Create a therapeutic timeline for the user.
@@ -234,9 +365,8 @@ class ConversationMemoryService:
         Returns:
             List of dictionaries containing timeline events.
         """
-        timeline = []
-        
         # Add formal sessions to timeline
+        session_events = []
         formal_sessions = (
             self.db.query(Conversation)
             .filter(
@@ -248,7 +378,7 @@ class ConversationMemoryService:
         )
         
         for session in formal_sessions:
-            timeline.append({
+            session_events.append({
                 "type": "formal_session",
                 "date": session.started_at,
                 "title": session.title or f"Session #{session.session_number}",
@@ -264,6 +394,7 @@ class ConversationMemoryService:
             })
         
         # Add important memories to timeline
+        memory_events = []
         memories = (
             self.db.query(ImportantMemory)
             .filter(ImportantMemory.user_id == self.user.id)
@@ -272,7 +403,7 @@ class ConversationMemoryService:
         )
         
         for memory in memories:
-            timeline.append({
+            memory_events.append({
                 "type": "important_memory",
                 "date": memory.created_at,
                 "title": f"Memory: {memory.category.capitalize()}" if memory.category else "Important Memory",
@@ -284,6 +415,8 @@ class ConversationMemoryService:
             })
         
         # Add homework assignments to timeline
+        assigned_events = []
+        completed_events = []
         from src.mental_health_coach.models.homework import HomeworkAssignment
         
         assignments = (
@@ -295,7 +428,7 @@ class ConversationMemoryService:
         
         for assignment in assignments:
             # Add assignment creation
-            timeline.append({
+            assigned_events.append({
                 "type": "homework_assigned",
                 "date": assignment.created_at,
                 "title": f"Homework: {assignment.title}",
@@ -309,7 +442,7 @@ class ConversationMemoryService:
             
             # Add homework completion if completed
             if assignment.is_completed and assignment.completion_date:
-                timeline.append({
+                completed_events.append({
                     "type": "homework_completed",
                     "date": assignment.completion_date,
                     "title": f"Completed: {assignment.title}",
@@ -322,10 +455,18 @@ class ConversationMemoryService:
                     },
                 })
         
-        # Sort timeline by date
-        timeline.sort(key=lambda x: x["date"])
-        
-        return timeline
+        # Completions are not ordered by the query, so sort just those
+        completed_events.sort(key=itemgetter("date"))
+        
+        # Every stream is now in date order, so merge them rather than
+        # sorting the whole timeline
+        return list(heapq.merge(
+            session_events,
+            memory_events,
+            assigned_events,
+            completed_events,
+            key=itemgetter("date"),
+        ))
     
     def get_recent_themes(self, days: int = 30, min_occurrences: int = 2) -> List[Dict[str, Any]]:
         """Identify common themes in recent conversations.
@@ -337,6 +478,8 @@ class ConversationMemoryService:
         Returns:
             List of dictionaries containing theme information.
         """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        
         # Get recent conversations
         cutoff_date = datetime.datetime.utcnow() - datetime.timedelta(days=days)
         
@@ -382,22 +525,30 @@ class ConversationMemoryService:
             tfidf_matrix = vectorizer.fit_transform([user_messages])
             feature_names = vectorizer.get_feature_names_out()
             
-            # Get scores for each term
-            scores = tfidf_matrix.toarray()[0]
-            
-            # Create theme entries
-            themes = []
-            for term, score in zip(feature_names, scores):
-                if score > 0.01:  # Threshold to consider significant
-                    themes.append({
-                        "theme": term,
-                        "importance_score": float(score),
-                    })
+            # Read the scores of the terms present straight from the sparse
+            # row instead of densifying it across the whole vocabulary
+            row = tfidf_matrix[0]
+            row.sort_indices()
             
-            # Sort by importance
-            themes.sort(key=lambda x: x["importance_score"], reverse=True)
+            # Keep the top 10 significant terms by importance without sorting
+            # them all; ties keep vocabulary order as a stable sort would
+            top_terms = heapq.nlargest(
+                10,
+                (
+                    (term_index, score)
+                    for term_index, score in zip(row.indices, row.data)
+                    if score > 0.01  # Threshold to consider significant
+                ),
+                key=itemgetter(1),
+            )
             
-            return themes[:10]  # Return top 10 themes
+            return [
+                {
+                    "theme": feature_names[term_index],
+                    "importance_score": float(score),
+                }
+                for term_index, score in top_terms
+            ]
         except ValueError:
             # Handle case where vectorizer couldn't be fitted
             return [] 
\ No newline at end of file
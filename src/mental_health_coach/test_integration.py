@@ -24,6 +24,19 @@ def print_test(name, success, message=""):
         print(f"  {YELLOW}{message}{RESET}")
 
 
+def wait_for_server(timeout=2.0, interval=0.05):
+    """Poll the root endpoint until the server responds or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{BASE_URL}/", timeout=0.2).ok:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(interval)
+    return False
+
+
 def test_health_check():
     """Test the health check endpoint."""
     try:
@@ -157,7 +170,7 @@ def main():
     
     # Wait for server to be ready
     print("Waiting for server to be ready...")
-    time.sleep(2)
+    wait_for_server()
     
     # Test health check
     if not test_health_check():
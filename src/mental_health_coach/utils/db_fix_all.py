@@ -3,12 +3,18 @@
 This script checks and fixes all database schema issues in one go.
 """
 
+import hashlib
+import json
 import logging
-from sqlalchemy import create_engine, inspect, text
+from itertools import groupby
+from operator import itemgetter
+from sqlalchemy import inspect, text
 from datetime import datetime
 import os
 from dotenv import load_dotenv
 
+from src.mental_health_coach.database import make_engine, use_maintenance_pragmas
+
 # Load environment variables
 load_dotenv()
 
@@ -18,132 +24,178 @@ logger = logging.getLogger(__name__)
 
 # Database URL
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///mental_health_coach.db")
-engine = create_engine(DATABASE_URL)
+engine = make_engine(DATABASE_URL)
+use_maintenance_pragmas(engine)
+
+# Precomputed bcrypt hash of "testpassword123" for the seeded test user, so
+# seeding does not pay for a fresh bcrypt round on every run
+TEST_USER_HASH = (
+    os.environ.get("TEST_USER_HASH")
+    or "$2b$12$G6ZorZY8IUviDeHJCRrx9Oika7jVWgR.eqKSErXrUkFH7CZw1gL42"
+)
+
+
+# Server-side timestamp default for the updated_at columns
+TIMESTAMP_DDL = "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
+
+# Columns that older databases may be missing, as (table, column, DDL fragment).
+# The resulting DDL takes no bind parameters, so it is sent straight to the
+# driver with exec_driver_sql instead of being parsed as a text() clause.
+SCHEMA_PATCHES = [
+    ('users', 'is_verified', 'BOOLEAN DEFAULT 0'),
+    ('users', 'profile_data', 'TEXT'),
+    ('messages', 'is_transcript', 'BOOLEAN DEFAULT 0'),
+    ('messages', 'updated_at', TIMESTAMP_DDL),
+    ('conversations', 'updated_at', TIMESTAMP_DDL),
+    ('important_memories', 'updated_at', TIMESTAMP_DDL),
+    ('homework_assignments', 'updated_at', TIMESTAMP_DDL),
+    ('assessments', 'updated_at', TIMESTAMP_DDL),
+    ('user_profiles', 'updated_at', TIMESTAMP_DDL),
+    ('session_schedules', 'updated_at', TIMESTAMP_DDL),
+    ('emergency_contacts', 'updated_at', TIMESTAMP_DDL),
+]
+
+
+def _add_column_sqlite(conn, table, column, ddl):
+    """Add a single column on SQLite.
+    
+    SQLite rejects ``DEFAULT CURRENT_TIMESTAMP`` in ``ALTER TABLE ADD COLUMN``
+    on non-empty tables, so the column is added without a default and
+    existing rows are backfilled server-side instead.
+    """
+    if ddl == TIMESTAMP_DDL:
+        conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} TIMESTAMP")
+        conn.exec_driver_sql(f"UPDATE {table} SET {column} = CURRENT_TIMESTAMP")
+    else:
+        conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
+
+def _schema_fingerprint(conn):
+    """Compute a cheap fingerprint of the current schema.
+    
+    On SQLite this is a single read of ``sqlite_master``, reduced to a
+    positive 31-bit integer so it fits in ``PRAGMA user_version``; other
+    dialects have no equally cheap probe, so ``None`` is returned and the
+    full check always runs.
+    """
+    if engine.dialect.name != "sqlite":
+        return None
+    
+    rows = conn.exec_driver_sql(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'table' ORDER BY name"
+    ).all()
+    payload = json.dumps([SCHEMA_PATCHES, [list(row) for row in rows]])
+    digest = int(hashlib.md5(payload.encode()).hexdigest(), 16)
+    # Never 0, which is user_version's value in a fresh database
+    return digest % 0x7FFFFFFF + 1
+
+
+def _read_fingerprint(conn):
+    """Return the fingerprint stored in the database's ``user_version``.
+    
+    The fingerprint lives in the database itself, so it follows the file
+    and needs no writable location beside the code.
+    """
+    return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def _write_fingerprint(conn, fingerprint):
+    """Store a fingerprint in the database's ``user_version``."""
+    # PRAGMA takes no bind parameters; the value is always an int
+    conn.exec_driver_sql(f"PRAGMA user_version = {int(fingerprint)}")
+
+
+def _columns_by_table(conn):
+    """Map each table in the database to the set of its column names.
+    
+    On SQLite all tables are covered by one ``pragma_table_info`` join
+    instead of a ``PRAGMA table_info`` round-trip per table; other dialects
+    use the inspector's batched reflection where available.
+    """
+    if engine.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql(
+            "SELECT m.name, p.name FROM sqlite_master AS m, pragma_table_info(m.name) AS p "
+            "WHERE m.type = 'table'"
+        )
+        cols_by_table = {}
+        for table, column in rows:
+            cols_by_table.setdefault(table, set()).add(column)
+        return cols_by_table
+    
+    inspector = inspect(conn)
+    if hasattr(inspector, "get_multi_columns"):
+        # SQLAlchemy 2.0 reflects every table's columns in one batched call
+        return {
+            table: {col['name'] for col in columns}
+            for (_, table), columns in inspector.get_multi_columns().items()
+        }
+    
+    return {
+        table: {col['name'] for col in inspector.get_columns(table)}
+        for table in inspector.get_table_names()
+    }
 
 
 def fix_all_schema_issues():
     """Fix all known database schema issues."""
-    inspector = inspect(engine)
-    
-    with engine.connect() as conn:
-        # 1. Fix users table
-        if 'users' in inspector.get_table_names():
-            columns = [col['name'] for col in inspector.get_columns('users')]
-            
-            if 'is_verified' not in columns:
-                logger.info("Adding is_verified column to users table")
-                conn.execute(text("ALTER TABLE users ADD COLUMN is_verified BOOLEAN DEFAULT 0"))
-                conn.commit()
-            
-            if 'profile_data' not in columns:
-                logger.info("Adding profile_data column to users table")
-                conn.execute(text("ALTER TABLE users ADD COLUMN profile_data TEXT"))
-                conn.commit()
-        
-        # 2. Fix messages table
-        if 'messages' in inspector.get_table_names():
-            columns = [col['name'] for col in inspector.get_columns('messages')]
-            
-            if 'is_transcript' not in columns:
-                logger.info("Adding is_transcript column to messages table")
-                conn.execute(text("ALTER TABLE messages ADD COLUMN is_transcript BOOLEAN DEFAULT 0"))
-                conn.commit()
-            
-            if 'updated_at' not in columns:
-                logger.info("Adding updated_at column to messages table")
-                conn.execute(text(f"ALTER TABLE messages ADD COLUMN updated_at TIMESTAMP DEFAULT '{datetime.utcnow().isoformat()}'"))
-                conn.commit()
-        
-        # 3. Fix conversations table
-        if 'conversations' in inspector.get_table_names():
-            columns = [col['name'] for col in inspector.get_columns('conversations')]
-            
-            if 'updated_at' not in columns:
-                logger.info("Adding updated_at column to conversations table")
-                conn.execute(text(f"ALTER TABLE conversations ADD COLUMN updated_at TIMESTAMP DEFAULT '{datetime.utcnow().isoformat()}'"))
-                conn.commit()
-        
-        # 4. Fix important_memories table
-        if 'important_memories' in inspector.get_table_names():
-            columns = [col['name'] for col in inspector.get_columns('important_memories')]
-            
-            if 'updated_at' not in columns:
-                logger.info("Adding updated_at column to important_memories table")
-                conn.execute(text(f"ALTER TABLE important_memories ADD COLUMN updated_at TIMESTAMP DEFAULT '{datetime.utcnow().isoformat()}'"))
-                conn.commit()
-        
-        # 5. Fix homework_assignments table
-        if 'homework_assignments' in inspector.get_table_names():
-            columns = [col['name'] for col in inspector.get_columns('homework_assignments')]
-            
-            if 'updated_at' not in columns:
-                logger.info("Adding updated_at column to homework_assignments table")
-                conn.execute(text(f"ALTER TABLE homework_assignments ADD COLUMN updated_at TIMESTAMP DEFAULT '{datetime.utcnow().isoformat()}'"))
-                conn.commit()
-        
-        # 6. Fix assessments table
-        if 'assessments' in inspector.get_table_names():
-            columns = [col['name'] for col in inspector.get_columns('assessments')]
-            
-            if 'updated_at' not in columns:
-                logger.info("Adding updated_at column to assessments table")
-                conn.execute(text(f"ALTER TABLE assessments ADD COLUMN updated_at TIMESTAMP DEFAULT '{datetime.utcnow().isoformat()}'"))
-                conn.commit()
+    # Check and apply every patch in one transaction that commits once on exit
+    with engine.begin() as conn:
+        fingerprint = _schema_fingerprint(conn)
+        if fingerprint is not None and fingerprint == _read_fingerprint(conn):
+            logger.info("Database schema is already up-to-date")
+            return
         
-        # 7. Fix user_profiles table
-        if 'user_profiles' in inspector.get_table_names():
-            columns = [col['name'] for col in inspector.get_columns('user_profiles')]
-            
-            if 'updated_at' not in columns:
-                logger.info("Adding updated_at column to user_profiles table")
-                conn.execute(text(f"ALTER TABLE user_profiles ADD COLUMN updated_at TIMESTAMP DEFAULT '{datetime.utcnow().isoformat()}'"))
-                conn.commit()
+        cols_by_table = _columns_by_table(conn)
         
-        # 8. Fix session_schedules table
-        if 'session_schedules' in inspector.get_table_names():
-            columns = [col['name'] for col in inspector.get_columns('session_schedules')]
-            
-            if 'updated_at' not in columns:
-                logger.info("Adding updated_at column to session_schedules table")
-                conn.execute(text(f"ALTER TABLE session_schedules ADD COLUMN updated_at TIMESTAMP DEFAULT '{datetime.utcnow().isoformat()}'"))
-                conn.commit()
+        # Keep only the patches whose table exists and whose column is missing
+        pending = sorted(
+            (patch for patch in SCHEMA_PATCHES
+             if patch[0] in cols_by_table and patch[1] not in cols_by_table[patch[0]]),
+            key=itemgetter(0),
+        )
         
-        # 9. Fix emergency_contacts table
-        if 'emergency_contacts' in inspector.get_table_names():
-            columns = [col['name'] for col in inspector.get_columns('emergency_contacts')]
+        for table, patches in groupby(pending, key=itemgetter(0)):
+            patches = list(patches)
+            for _, column, _ in patches:
+                logger.info(f"Adding {column} column to {table} table")
             
-            if 'updated_at' not in columns:
-                logger.info("Adding updated_at column to emergency_contacts table")
-                conn.execute(text(f"ALTER TABLE emergency_contacts ADD COLUMN updated_at TIMESTAMP DEFAULT '{datetime.utcnow().isoformat()}'"))
-                conn.commit()
+            if engine.dialect.name == "postgresql":
+                # Postgres accepts several ADD COLUMN clauses in one statement
+                clauses = ", ".join(
+                    f"ADD COLUMN {column} {ddl}" for _, column, ddl in patches
+                )
+                conn.exec_driver_sql(f"ALTER TABLE {table} {clauses}")
+            else:
+                # SQLite only allows one ADD COLUMN per ALTER TABLE
+                for _, column, ddl in patches:
+                    _add_column_sqlite(conn, table, column, ddl)
         
-        logger.info("All schema fixes applied successfully!")
+        # Recorded in the same transaction as the patches it vouches for
+        fingerprint = _schema_fingerprint(conn)
+        if fingerprint is not None:
+            _write_fingerprint(conn, fingerprint)
+    
+    logger.info("All schema fixes applied successfully!")
 
 
 def create_test_user():
     """Create a test user for testing purposes."""
-    from src.mental_health_coach.auth.security import get_password_hash
-    
-    with engine.connect() as conn:
-        # Check if test user already exists
-        result = conn.execute(text("SELECT id FROM users WHERE email = 'test@example.com'"))
-        if result.fetchone():
-            logger.info("Test user already exists")
-            return
-        
-        # Create test user
-        hashed_password = get_password_hash("testpassword123")
-        conn.execute(text("""
+    with engine.begin() as conn:
+        result = conn.execute(text("""
             INSERT INTO users (email, hashed_password, first_name, last_name, is_active, is_verified, created_at)
             VALUES (:email, :password, :first_name, :last_name, 1, 1, :created_at)
+            ON CONFLICT(email) DO NOTHING
         """), {
             "email": "test@example.com",
-            "password": hashed_password,
+            "password": TEST_USER_HASH,
             "first_name": "Test",
             "last_name": "User",
             "created_at": datetime.utcnow().isoformat()
         })
-        conn.commit()
+    
+    if result.rowcount == 0:
+        logger.info("Test user already exists")
+    else:
         logger.info("Test user created: test@example.com / testpassword123")
 
 
@@ -8,13 +8,11 @@ import argparse
 import logging
 import sys
 import os
+from typing import Callable, Dict, Tuple
 
 # Ensure the parent directory is in the path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
 
-from src.mental_health_coach.database import init_db, check_and_update_schema, engine
-from src.mental_health_coach.models.base import Base
-
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,9 +23,14 @@ logger = logging.getLogger(__name__)
 
 def create_all_tables():
     """Create all tables defined in the models."""
+    from src.mental_health_coach.database import engine
+    from src.mental_health_coach.models.base import Base
+    
     try:
         logger.info("Creating all database tables...")
-        Base.metadata.create_all(bind=engine)
+        # One transaction so the DDL commits together where the dialect allows
+        with engine.begin() as conn:
+            Base.metadata.create_all(bind=conn)
         logger.info("Successfully created all tables.")
     except Exception as e:
         logger.error(f"Failed to create tables: {e}")
@@ -36,6 +39,8 @@ def create_all_tables():
 
 def check_schema():
     """Check if the database schema matches the models."""
+    from src.mental_health_coach.database import check_and_update_schema
+    
     try:
         logger.info("Checking database schema...")
         check_and_update_schema()
@@ -47,55 +52,69 @@ def check_schema():
 
 def reset_database():
     """Drop all tables and recreate them (WARNING: This will delete all data)."""
+    from src.mental_health_coach.database import engine
+    from src.mental_health_coach.models.base import Base
+    
     try:
         confirm = input("This will delete ALL data in the database. Type 'yes' to confirm: ")
         if confirm.lower() != "yes":
             logger.info("Database reset cancelled.")
             return
         
-        logger.warning("Dropping all tables...")
-        Base.metadata.drop_all(bind=engine)
-        logger.info("Successfully dropped all tables.")
-        
-        logger.info("Recreating all tables...")
-        Base.metadata.create_all(bind=engine)
-        logger.info("Successfully recreated all tables.")
+        with engine.begin() as conn:
+            logger.warning("Dropping all tables...")
+            Base.metadata.drop_all(bind=conn)
+            logger.info("Successfully dropped all tables.")
+            
+            # Everything was just dropped, so skip the per-table existence probe
+            logger.info("Recreating all tables...")
+            Base.metadata.create_all(bind=conn, checkfirst=False)
+            logger.info("Successfully recreated all tables.")
     except Exception as e:
         logger.error(f"Failed to reset database: {e}")
         sys.exit(1)
 
 
+def initialize_database():
+    """Initialize the database (create tables and check schema)."""
+    from src.mental_health_coach.database import init_db
+    
+    init_db()
+    logger.info("Database initialization completed successfully.")
+
+
+# Command name -> (handler, help text). Handlers import the database layer
+# lazily so that ``--help`` does not pay for it.
+COMMANDS: Dict[str, Tuple[Callable[[], None], str]] = {
+    "create_tables": (create_all_tables, "Create all database tables"),
+    "check_schema": (check_schema, "Check if the database schema matches the models"),
+    "reset_database": (reset_database, "Reset the database (WARNING: This will delete all data)"),
+    "init_db": (initialize_database, "Initialize the database (create tables and check schema)"),
+}
+
+
 def main():
     """Main entry point for the database tools."""
     parser = argparse.ArgumentParser(description="Database maintenance tools")
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
     
-    # create_tables command
-    subparsers.add_parser("create_tables", help="Create all database tables")
-    
-    # check_schema command
-    subparsers.add_parser("check_schema", help="Check if the database schema matches the models")
-    
-    # reset_database command
-    subparsers.add_parser("reset_database", help="Reset the database (WARNING: This will delete all data)")
-    
-    # init_db command (runs both create_tables and check_schema)
-    subparsers.add_parser("init_db", help="Initialize the database (create tables and check schema)")
+    for name, (_, help_text) in COMMANDS.items():
+        subparsers.add_parser(name, help=help_text)
     
     args = parser.parse_args()
     
-    if args.command == "create_tables":
-        create_all_tables()
-    elif args.command == "check_schema":
-        check_schema()
-    elif args.command == "reset_database":
-        reset_database()
-    elif args.command == "init_db":
-        init_db()
-        logger.info("Database initialization completed successfully.")
+    if args.command in COMMANDS:
+        from src.mental_health_coach.database import engine, use_maintenance_pragmas
+        
+        # Nothing has connected yet, so every connection the command opens
+        # gets the pragmas
+        use_maintenance_pragmas(engine)
+        
+        handler, _ = COMMANDS[args.command]
+        handler()
     else:
         parser.print_help()
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
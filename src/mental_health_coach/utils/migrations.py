@@ -10,7 +10,7 @@ import json
 import logging
 import sqlite3
 import datetime
-from typing import List, Dict, Any, Callable
+from typing import List, Dict, Any, Callable, Optional
 
 # Set up logging
 logging.basicConfig(
@@ -35,27 +35,42 @@ class Migration:
         description: Description of what the migration does
         up: Function to apply the migration
         down: Function to roll back the migration
+        up_sql: Single SQL statement that applies the migration, if pure SQL
     """
     
     def __init__(
         self, 
         name: str, 
         description: str, 
-        up: Callable[[sqlite3.Connection], None], 
-        down: Callable[[sqlite3.Connection], None]
+        up: Optional[Callable[[sqlite3.Connection], None]] = None, 
+        down: Optional[Callable[[sqlite3.Connection], None]] = None,
+        up_sql: Optional[str] = None,
     ):
         """Initialize a new migration.
         
+        Either ``up`` or ``up_sql`` must be given. Pure-SQL migrations can be
+        batched together into a single script when applied.
+        
         Args:
             name: Unique name of the migration
             description: Description of what the migration does
             up: Function to apply the migration
             down: Function to roll back the migration
+            up_sql: Single SQL statement that applies the migration
         """
+        if up is None and up_sql is None:
+            raise ValueError(f"Migration {name} needs either up or up_sql")
+        
         self.name = name
         self.description = description
-        self.up = up
-        self.down = down
+        self.up_sql = up_sql
+        self.up = up if up is not None else (lambda conn: conn.execute(up_sql))
+        self.down = down if down is not None else _no_down
+
+
+def _no_down(conn: sqlite3.Connection) -> None:
+    """Default rollback for migrations that cannot be reversed on SQLite."""
+    logger.warning("SQLite does not support dropping columns")
 
 
 # List of all migrations
@@ -63,26 +78,22 @@ MIGRATIONS: List[Migration] = [
     Migration(
         name="add_is_verified_to_users",
         description="Add is_verified column to users table",
-        up=lambda conn: conn.execute("ALTER TABLE users ADD COLUMN is_verified BOOLEAN DEFAULT 0 NOT NULL"),
-        down=lambda conn: logger.warning("SQLite does not support dropping columns")
+        up_sql="ALTER TABLE users ADD COLUMN is_verified BOOLEAN DEFAULT 0 NOT NULL",
     ),
     Migration(
         name="add_profile_data_to_users",
         description="Add profile_data column to users table",
-        up=lambda conn: conn.execute("ALTER TABLE users ADD COLUMN profile_data TEXT"),
-        down=lambda conn: logger.warning("SQLite does not support dropping columns")
+        up_sql="ALTER TABLE users ADD COLUMN profile_data TEXT",
     ),
     Migration(
         name="add_summary_to_conversations",
         description="Add summary column to conversations table",
-        up=lambda conn: conn.execute("ALTER TABLE conversations ADD COLUMN summary TEXT"),
-        down=lambda conn: logger.warning("SQLite does not support dropping columns")
+        up_sql="ALTER TABLE conversations ADD COLUMN summary TEXT",
     ),
     Migration(
         name="add_user_id_to_messages",
         description="Add user_id column to messages table",
-        up=lambda conn: conn.execute("ALTER TABLE messages ADD COLUMN user_id INTEGER REFERENCES users(id)"),
-        down=lambda conn: logger.warning("SQLite does not support dropping columns")
+        up_sql="ALTER TABLE messages ADD COLUMN user_id INTEGER REFERENCES users(id)",
     ),
     # Add more migrations here as needed
 ]
@@ -110,42 +121,74 @@ def record_migration(name: str) -> None:
     Args:
         name: Name of the migration that was applied.
     """
+    record_migrations_bulk([name])
+
+
+def record_migrations_bulk(names: List[str]) -> None:
+    """Record that several migrations have been applied.
+    
+    The record file is read once and rewritten once, via a temporary file
+    that atomically replaces it, so concurrent readers never see a
+    partially written record.
+    
+    Args:
+        names: Names of the migrations that were applied, in order.
+    """
     applied = get_applied_migrations()
-    if name not in applied:
-        applied.append(name)
+    already = set(applied)
+    new_names = [name for name in names if name not in already]
+    if not new_names:
+        return
     
-    with open(MIGRATION_RECORD_FILE, "w") as f:
-        json.dump(applied, f)
+    tmp_path = f"{MIGRATION_RECORD_FILE}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(applied + new_names, f)
+    os.replace(tmp_path, MIGRATION_RECORD_FILE)
 
 
 def apply_migrations(db_path: str) -> None:
     """Apply all unapplied migrations.
     
+    All pending migrations run inside a single transaction, so either every
+    one of them is applied or none is.
+    
     Args:
         db_path: Path to the SQLite database file.
     """
     # Get list of applied migrations
-    applied = get_applied_migrations()
+    applied = set(get_applied_migrations())
+    pending = [migration for migration in MIGRATIONS if migration.name not in applied]
+    if not pending:
+        return
+    
+    for migration in pending:
+        logger.info(f"Applying migration: {migration.name} - {migration.description}")
     
-    # Connect to the database
-    conn = sqlite3.connect(db_path)
+    # Manage the transaction explicitly rather than via sqlite3's implicit BEGIN
+    conn = sqlite3.connect(db_path, isolation_level=None)
     
     try:
-        # Apply each unapplied migration
-        for migration in MIGRATIONS:
-            if migration.name not in applied:
-                logger.info(f"Applying migration: {migration.name} - {migration.description}")
-                try:
-                    migration.up(conn)
-                    conn.commit()
-                    record_migration(migration.name)
-                    logger.info(f"Successfully applied migration: {migration.name}")
-                except Exception as e:
-                    conn.rollback()
-                    logger.error(f"Failed to apply migration {migration.name}: {e}")
-                    raise
+        if all(migration.up_sql is not None for migration in pending):
+            # executescript commits any open transaction first, so the whole
+            # batch carries its own BEGIN/COMMIT
+            statements = [migration.up_sql.strip().rstrip(";") for migration in pending]
+            conn.executescript("BEGIN;\n" + ";\n".join(statements) + ";\nCOMMIT;")
+        else:
+            conn.execute("BEGIN")
+            for migration in pending:
+                migration.up(conn)
+            conn.execute("COMMIT")
+    except Exception as e:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        logger.error(f"Failed to apply migrations: {e}")
+        raise
     finally:
         conn.close()
+    
+    record_migrations_bulk([migration.name for migration in pending])
+    for migration in pending:
+        logger.info(f"Successfully applied migration: {migration.name}")
 
 
 def create_migration(name: str, description: str) -> None:
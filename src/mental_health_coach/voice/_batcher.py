@@ -0,0 +1,175 @@
+"""Micro-batching of speech-to-text requests from concurrent conversations."""
+
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from src.mental_health_coach.voice._cache import EngineCache, config_key
+from src.mental_health_coach.voice.speech_to_text import SpeechToTextEngine, SpeechToTextFactory
+
+logger = logging.getLogger(__name__)
+
+# Batch limits; larger batches stop paying off for typical ASR backends
+MAX_BATCH = 8
+MAX_DELAY = 0.005
+
+# Batchers shared by managers with the same speech-to-text configuration
+_BATCHERS = EngineCache()
+
+
+class MicroBatchingSTT:
+    """Coalesces transcription requests into batches for one engine.
+    
+    Requests arriving within ``max_delay`` seconds of the first, up to
+    ``max_batch`` of them, are passed to the engine's ``transcribe_batch``
+    together, so concurrent users share one inference call.
+    
+    Attributes:
+        engine: The wrapped speech-to-text engine.
+        max_batch: Maximum number of requests per batch.
+        max_delay: Seconds to wait for more requests after the first.
+        release_engine: Whether the engine came from
+            ``SpeechToTextFactory.get_shared_engine`` and is released once
+            the worker stops.
+    """
+    
+    shareable = True
+    
+    def __init__(self, engine: SpeechToTextEngine, max_batch: int = MAX_BATCH,
+                 max_delay: float = MAX_DELAY, release_engine: bool = False) -> None:
+        """Start batching requests for an engine.
+        
+        Args:
+            engine: The speech-to-text engine to wrap.
+            max_batch: Maximum number of requests per batch.
+            max_delay: Seconds to wait for more requests after the first.
+            release_engine: Whether to release the engine to the factory's
+                cache once the worker stops.
+        """
+        self.engine = engine
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.release_engine = release_engine
+        self._queue: "queue.Queue[Optional[Tuple[BinaryIO, Future]]]" = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="stt-batcher", daemon=True)
+        self._worker.start()
+    
+    def transcribe_async(self, audio_file: BinaryIO) -> "Future[str]":
+        """Queue a recording for transcription.
+        
+        Args:
+            audio_file: A file-like object containing audio data.
+        
+        Returns:
+            Future[str]: Future resolved with the transcribed text.
+        """
+        future: "Future[str]" = Future()
+        self._queue.put((audio_file, future))
+        return future
+    
+    def transcribe_audio(self, audio_file: BinaryIO) -> str:
+        """Transcribe a recording, waiting for its batch to finish.
+        
+        Args:
+            audio_file: A file-like object containing audio data.
+        
+        Returns:
+            str: The transcribed text.
+        """
+        return self.transcribe_async(audio_file).result()
+    
+    def close(self) -> None:
+        """Stop the worker once the requests already queued are done."""
+        self._queue.put(None)
+    
+    def _run(self) -> None:
+        """Run the worker, releasing the engine once it stops."""
+        try:
+            self._batch_until_closed()
+        finally:
+            if self.release_engine:
+                SpeechToTextFactory.release_engine(self.engine)
+    
+    def _batch_until_closed(self) -> None:
+        """Collect requests into batches and dispatch them until closed."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._dispatch(batch)
+                    return
+                batch.append(item)
+            
+            self._dispatch(batch)
+    
+    def _dispatch(self, batch: List[Tuple[BinaryIO, Future]]) -> None:
+        """Transcribe one batch and resolve its futures.
+        
+        Args:
+            batch: The queued recordings and their futures.
+        """
+        try:
+            results = self.engine.transcribe_batch([audio_file for audio_file, _ in batch])
+        except Exception as e:
+            logger.error("Batch transcription failed: %s", e, exc_info=True)
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+
+def acquire_batcher(engine_type: str, config: Dict[str, Any]) -> MicroBatchingSTT:
+    """Get the batcher shared by all users of an engine configuration.
+    
+    The batcher wraps the engine cached by ``SpeechToTextFactory``, so it
+    shares the loaded model with the conversation managers using the same
+    configuration. Configurations that cannot be used as a cache key get a
+    batcher of their own.
+    
+    Args:
+        engine_type: The type of speech-to-text engine.
+        config: Configuration dictionary for the engine.
+    
+    Returns:
+        MicroBatchingSTT: The batcher; release it with ``release_batcher``.
+    """
+    def create() -> MicroBatchingSTT:
+        """Create a batcher around the shared engine."""
+        return MicroBatchingSTT(
+            SpeechToTextFactory.get_shared_engine(engine_type, config),
+            release_engine=True,
+        )
+    
+    key = config_key(engine_type, config)
+    if key is None:
+        return create()
+    
+    batcher, _ = _BATCHERS.acquire(key, create)
+    return batcher
+
+
+def release_batcher(batcher: MicroBatchingSTT) -> None:
+    """Release a batcher obtained from ``acquire_batcher``.
+    
+    Args:
+        batcher: The batcher to release.
+    """
+    if not _BATCHERS.release(batcher):
+        batcher.close()
@@ -0,0 +1,110 @@
+"""Reference-counted cache of speech engine instances."""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+def config_key(engine_type: str, config: Dict[str, Any]) -> Optional[Hashable]:
+    """Build a cache key for an engine type and configuration.
+    
+    Args:
+        engine_type: The type of engine.
+        config: Configuration dictionary for the engine.
+    
+    Returns:
+        Optional[Hashable]: The key, or None if the configuration contains
+            unhashable values and cannot be cached.
+    """
+    key = (engine_type, tuple(sorted(config.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class EngineCache:
+    """Thread-safe cache that shares engines between their users.
+    
+    Each cached engine carries a reference count; it is evicted when the
+    last user releases it, and its ``close`` method is called if it has one.
+    """
+    
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._lock = threading.Lock()
+        # key -> [engine, reference count]
+        self._entries: Dict[Hashable, List[Any]] = {}
+        self._keys: Dict[int, Hashable] = {}
+        # key -> lock held while that key's engine is being created
+        self._creating: Dict[Hashable, threading.Lock] = {}
+    
+    def acquire(self, key: Hashable, create: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Get the cached engine for a key, creating it if needed.
+        
+        Engines whose ``shareable`` attribute is false are never cached.
+        The engine is created holding only a lock for its key, so loading one
+        model does not block users of other keys.
+        
+        Args:
+            key: Cache key from ``config_key``.
+            create: Function that constructs a new engine.
+        
+        Returns:
+            Tuple[Any, bool]: The engine, and whether it is shared via the cache.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[1] += 1
+                return entry[0], True
+            key_lock = self._creating.setdefault(key, threading.Lock())
+        
+        with key_lock:
+            # Another user may have created the engine while we waited
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry[1] += 1
+                    return entry[0], True
+            
+            try:
+                engine = create()
+                shareable = bool(getattr(engine, "shareable", False))
+                if shareable:
+                    with self._lock:
+                        self._entries[key] = [engine, 1]
+                        self._keys[id(engine)] = key
+            finally:
+                with self._lock:
+                    if self._creating.get(key) is key_lock:
+                        del self._creating[key]
+            return engine, shareable
+    
+    def release(self, engine: Any) -> bool:
+        """Drop one reference to an engine, evicting it at zero.
+        
+        Args:
+            engine: An engine returned by ``acquire``.
+            
+        Returns:
+            bool: True if the engine is managed by the cache, False if it was
+                never cached and the caller remains responsible for it.
+        """
+        with self._lock:
+            key = self._keys.get(id(engine))
+            if key is None:
+                return False
+            
+            entry = self._entries[key]
+            entry[1] -= 1
+            if entry[1] > 0:
+                return True
+            
+            del self._entries[key]
+            del self._keys[id(engine)]
+        
+        close = getattr(engine, "close", None)
+        if close is not None:
+            close()
+        return True
@@ -0,0 +1,116 @@
+"""Pool of reusable PCM buffers for the audio path."""
+
+import queue
+from typing import Dict, Optional, Sequence
+
+
+class PooledBuffer:
+    """A buffer borrowed from a ``BufferPool``.
+    
+    The buffer is exposed as a memoryview of exactly the requested size and
+    is returned to its pool on ``close`` or when used as a context manager
+    exits. The view must not be used after that.
+    
+    Attributes:
+        view: Writable view of the requested number of bytes.
+    """
+    
+    def __init__(self, pool: "BufferPool", buffer: bytearray, size: int) -> None:
+        """Wrap a buffer taken from a pool.
+        
+        Args:
+            pool: The pool the buffer is returned to.
+            buffer: The underlying buffer; at least ``size`` bytes long.
+            size: The number of bytes requested.
+        """
+        self._pool = pool
+        self._buffer: Optional[bytearray] = buffer
+        self._base = memoryview(buffer)
+        self.view = self._base[:size]
+    
+    def __len__(self) -> int:
+        """Return the requested size of the buffer."""
+        return len(self.view)
+    
+    def __enter__(self) -> "PooledBuffer":
+        """Return the buffer for use in a ``with`` block."""
+        return self
+    
+    def __exit__(self, *exc_info: object) -> None:
+        """Return the buffer to its pool."""
+        self.close()
+    
+    def close(self) -> None:
+        """Release the views and return the buffer to its pool."""
+        if self._buffer is None:
+            return
+        
+        self.view.release()
+        self._base.release()
+        self._pool.release(self._buffer)
+        self._buffer = None
+
+
+class BufferPool:
+    """Size-tiered pool of reusable ``bytearray`` buffers.
+    
+    Requests are rounded up to the smallest tier that fits, and freed
+    buffers are reused last-in first-out so recently touched memory stays
+    warm. Requests larger than every tier are allocated and discarded as
+    usual.
+    """
+    
+    def __init__(self, tiers: Sequence[int] = (16 * 1024, 256 * 1024, 1024 * 1024),
+                 max_per_tier: int = 8) -> None:
+        """Initialize an empty pool.
+        
+        Args:
+            tiers: Buffer sizes, in bytes, that the pool keeps.
+            max_per_tier: Maximum number of free buffers kept per tier.
+        """
+        self._tiers = sorted(tiers)
+        self._free: Dict[int, "queue.LifoQueue[bytearray]"] = {
+            tier: queue.LifoQueue(maxsize=max_per_tier) for tier in self._tiers
+        }
+    
+    def acquire(self, size: int) -> PooledBuffer:
+        """Borrow a buffer of at least ``size`` bytes.
+        
+        Args:
+            size: The number of bytes needed.
+        
+        Returns:
+            PooledBuffer: The borrowed buffer.
+        """
+        tier = next((tier for tier in self._tiers if size <= tier), None)
+        if tier is None:
+            return PooledBuffer(self, bytearray(size), size)
+        
+        try:
+            buffer = self._free[tier].get_nowait()
+        except queue.Empty:
+            buffer = bytearray(tier)
+        return PooledBuffer(self, buffer, size)
+    
+    def release(self, buffer: bytearray) -> None:
+        """Return a buffer to the pool.
+        
+        Buffers that do not match a tier, or that would exceed the tier's
+        limit, are left for the garbage collector.
+        
+        Args:
+            buffer: The buffer to return.
+        """
+        free = self._free.get(len(buffer))
+        if free is None:
+            return
+        
+        try:
+            free.put_nowait(buffer)
+        except queue.Full:
+            pass
+
+
+# Pool shared by the audio path; the largest tier holds a full 30 second
+# streaming window of 16 kHz 16-bit audio
+POOL = BufferPool()
@@ -1,10 +1,15 @@
 """Audio input/output functionality for voice conversations."""
 
+import io
 import os
+import mmap
+import sched
+import time
 import logging
+import tempfile
 import threading
 from abc import ABC, abstractmethod
-from typing import Optional, Callable, BinaryIO, Dict, Any, List
+from typing import Optional, Callable, BinaryIO, Dict, Any, Iterable, List, Type, Union
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +22,11 @@ class AudioRecorder(ABC):
     
     Attributes:
         config: Configuration dictionary for the recorder.
+        supports_chunks: Whether ``read_chunk`` can deliver audio while recording.
     """
     
+    supports_chunks = False
+    
     def __init__(self, config: Dict[str, Any]) -> None:
         """Initialize the audio recorder.
         
@@ -27,6 +35,17 @@ class AudioRecorder(ABC):
         """
         self.config = config
     
+    def read_chunk(self) -> Optional[bytes]:
+        """Read the audio captured since the previous call.
+        
+        Recorders that set ``supports_chunks`` override this so audio can be
+        streamed to speech-to-text while recording is still in progress.
+        
+        Returns:
+            Optional[bytes]: The newly captured audio, or None if none is available.
+        """
+        return None
+    
     @abstractmethod
     def start_recording(self) -> None:
         """Start recording audio.
@@ -53,6 +72,24 @@ class AudioRecorder(ABC):
         """
         pass
     
+    def save_to_buffer(self) -> io.BytesIO:
+        """Return the last recording as an in-memory file.
+        
+        Recorders should override this to avoid the filesystem; the default
+        round-trips through ``save_recording`` and a temporary file.
+        
+        Returns:
+            io.BytesIO: The recorded audio, positioned at the start.
+        """
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            self.save_recording(path)
+            with open(path, "rb") as f:
+                return io.BytesIO(f.read())
+        finally:
+            os.unlink(path)
+    
     @abstractmethod
     def is_recording(self) -> bool:
         """Check if recording is in progress.
@@ -71,8 +108,14 @@ class AudioPlayer(ABC):
     
     Attributes:
         config: Configuration dictionary for the player.
+        on_playback_complete: Callback invoked when playback finishes on its own.
+        accepts_views: Whether ``play_audio`` is done with its argument by the
+            time it returns, so it can be passed a memoryview that is
+            released immediately afterwards.
     """
     
+    accepts_views = False
+    
     def __init__(self, config: Dict[str, Any]) -> None:
         """Initialize the audio player.
         
@@ -80,24 +123,64 @@ class AudioPlayer(ABC):
             config: Configuration dictionary for the player.
         """
         self.config = config
+        self.on_playback_complete: Optional[Callable[[], None]] = None
+    
+    def set_on_playback_complete(self, callback: Callable[[], None]) -> None:
+        """Set the callback for playback completion.
+        
+        Args:
+            callback: Function to call when playback finishes.
+        """
+        self.on_playback_complete = callback
     
     @abstractmethod
-    def play_audio(self, audio_data: bytes) -> None:
+    def play_audio(self, audio_data: Union[bytes, memoryview]) -> None:
         """Play audio from memory.
         
         Args:
-            audio_data: The audio data to play.
+            audio_data: The audio data to play. This is always bytes unless
+                the player sets ``accepts_views``; it may then be a memoryview
+                that becomes invalid once this method returns, so the player
+                must copy anything it still needs.
         """
         pass
     
-    @abstractmethod
+    def play_stream(self, chunks: Iterable[bytes]) -> None:
+        """Play audio that arrives as a sequence of chunks.
+        
+        Players that can write to the device incrementally should override
+        this so playback starts with the first chunk. The default joins the
+        chunks and plays them with ``play_audio``.
+        
+        Args:
+            chunks: Successive chunks of audio data.
+        """
+        self.play_audio(b"".join(chunks))
+    
     def play_file(self, filename: str) -> None:
         """Play audio from a file.
         
+        The default implementation reads the file and passes its contents to
+        ``play_audio``. Players that set ``accepts_views`` instead get a
+        zero-copy view of the memory-mapped file, which is unmapped as soon as
+        ``play_audio`` returns.
+        
         Args:
             filename: The name of the file to play.
         """
-        pass
+        with open(filename, "rb") as f:
+            if not self.accepts_views:
+                self.play_audio(f.read())
+                return
+            
+            if os.fstat(f.fileno()).st_size == 0:
+                # mmap cannot map an empty file
+                self.play_audio(b"")
+                return
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    self.play_audio(view)
     
     @abstractmethod
     def stop_playback(self) -> None:
@@ -119,8 +202,16 @@ class MockAudioRecorder(AudioRecorder):
     
     This implementation doesn't perform actual audio recording but
     can be used for testing without external dependencies.
+    
+    Set ``config["in_memory_only"]`` to keep saved recordings in memory
+    instead of writing them to disk; they can then be read back with
+    ``get_saved``.
     """
     
+    supports_chunks = True
+    
+    _saved: Dict[str, bytes] = {}
+    
     def __init__(self, config: Dict[str, Any]) -> None:
         """Initialize the mock audio recorder.
         
@@ -147,16 +238,51 @@ class MockAudioRecorder(AudioRecorder):
         self._last_recording = b"mock_audio_data"
         return self._last_recording
     
+    def read_chunk(self) -> Optional[bytes]:
+        """Return a chunk of silent mock audio while recording.
+        
+        Returns:
+            Optional[bytes]: ``config["chunk_size"]`` zero bytes, or None when
+                not recording.
+        """
+        if not self._recording:
+            return None
+        return bytes(self.config.get("chunk_size", 3200))
+    
     def save_recording(self, filename: str) -> None:
         """Save mock recording to a file.
         
         Args:
             filename: The name of the file to save the recording to.
         """
-        logger.info(f"Mock Recorder: Saving recording to {filename}")
+        logger.info("Mock Recorder: Saving recording to %s", filename)
+        if self.config.get("in_memory_only", False):
+            MockAudioRecorder._saved[filename] = self._last_recording
+            return
+        
         with open(filename, "wb") as f:
             f.write(self._last_recording)
     
+    def save_to_buffer(self) -> io.BytesIO:
+        """Return the mock recording as an in-memory file.
+        
+        Returns:
+            io.BytesIO: The recorded audio, positioned at the start.
+        """
+        return io.BytesIO(self._last_recording)
+    
+    @classmethod
+    def get_saved(cls, filename: str) -> Optional[bytes]:
+        """Get a recording saved in memory-only mode.
+        
+        Args:
+            filename: The name the recording was saved under.
+            
+        Returns:
+            Optional[bytes]: The saved audio data, or None if nothing was saved.
+        """
+        return cls._saved.get(filename)
+    
     def is_recording(self) -> bool:
         """Check if mock recording is in progress.
         
@@ -171,8 +297,19 @@ class MockAudioPlayer(AudioPlayer):
     
     This implementation doesn't perform actual audio playback but
     can be used for testing without external dependencies.
+    
+    Simulated playback completion is scheduled on a single scheduler shared
+    by all mock players, so repeated playback does not start a thread per call.
     """
     
+    PLAYBACK_DURATION = 0.5
+    
+    accepts_views = True
+    
+    _scheduler = sched.scheduler(time.monotonic, time.sleep)
+    _scheduler_lock = threading.Lock()
+    _worker: Optional[threading.Thread] = None
+    
     def __init__(self, config: Dict[str, Any]) -> None:
         """Initialize the mock audio player.
         
@@ -181,17 +318,33 @@ class MockAudioPlayer(AudioPlayer):
         """
         super().__init__(config)
         self._playing = False
+        self._pending: Optional[sched.Event] = None
     
-    def play_audio(self, audio_data: bytes) -> None:
+    def play_audio(self, audio_data: Union[bytes, memoryview]) -> None:
         """Mock playing audio from memory.
         
         Args:
             audio_data: The audio data to play.
         """
-        logger.info(f"Mock Player: Playing audio data ({len(audio_data)} bytes)")
+        logger.info("Mock Player: Playing audio data (%d bytes)", len(audio_data))
         self._playing = True
         # Simulate playback completion after a short delay
-        threading.Timer(0.5, self._complete_playback).start()
+        self._schedule_completion()
+    
+    def play_stream(self, chunks: Iterable[bytes]) -> None:
+        """Mock playing audio chunks as they arrive.
+        
+        Args:
+            chunks: Successive chunks of audio data.
+        """
+        total = 0
+        for chunk in chunks:
+            self._playing = True
+            total += len(chunk)
+        logger.info("Mock Player: Played streamed audio (%d bytes)", total)
+        self._playing = True
+        # Simulate playback completion after a short delay
+        self._schedule_completion()
     
     def play_file(self, filename: str) -> None:
         """Mock playing audio from a file.
@@ -199,19 +352,58 @@ class MockAudioPlayer(AudioPlayer):
         Args:
             filename: The name of the file to play.
         """
-        logger.info(f"Mock Player: Playing audio file {filename}")
+        logger.info("Mock Player: Playing audio file %s", filename)
         self._playing = True
         # Simulate playback completion after a short delay
-        threading.Timer(0.5, self._complete_playback).start()
+        self._schedule_completion()
+    
+    def _schedule_completion(self) -> None:
+        """Schedule playback completion on the shared scheduler."""
+        cls = MockAudioPlayer
+        with cls._scheduler_lock:
+            self._cancel_pending()
+            self._pending = cls._scheduler.enter(
+                self.PLAYBACK_DURATION, 1, self._complete_playback
+            )
+            if cls._worker is None:
+                cls._worker = threading.Thread(
+                    target=cls._run_scheduler, name="mock-audio-player", daemon=True
+                )
+                cls._worker.start()
+    
+    @classmethod
+    def _run_scheduler(cls) -> None:
+        """Run scheduled events until the queue drains, then exit the worker."""
+        while True:
+            cls._scheduler.run()
+            with cls._scheduler_lock:
+                if cls._scheduler.empty():
+                    cls._worker = None
+                    return
+    
+    def _cancel_pending(self) -> None:
+        """Cancel this player's pending completion event, if any."""
+        if self._pending is not None:
+            try:
+                MockAudioPlayer._scheduler.cancel(self._pending)
+            except ValueError:
+                # The event has already run
+                pass
+            self._pending = None
     
     def _complete_playback(self) -> None:
         """Mark playback as complete."""
+        self._pending = None
         self._playing = False
         logger.info("Mock Player: Playback complete")
+        if self.on_playback_complete:
+            self.on_playback_complete()
     
     def stop_playback(self) -> None:
         """Stop mock audio playback."""
         logger.info("Mock Player: Stopping playback")
+        with MockAudioPlayer._scheduler_lock:
+            self._cancel_pending()
         self._playing = False
     
     def is_playing(self) -> bool:
@@ -223,13 +415,39 @@ class MockAudioPlayer(AudioPlayer):
         return self._playing
 
 
+# Registered audio backends, keyed by type name
+_RECORDERS: Dict[str, Type[AudioRecorder]] = {"mock": MockAudioRecorder}
+_PLAYERS: Dict[str, Type[AudioPlayer]] = {"mock": MockAudioPlayer}
+
+
 class AudioIOFactory:
     """Factory for creating audio I/O components.
     
     This factory creates the appropriate audio recorder and player
-    based on configuration settings.
+    based on configuration settings. Additional backends can be added
+    with ``register_recorder`` and ``register_player``.
     """
     
+    @staticmethod
+    def register_recorder(recorder_type: str, recorder_class: Type[AudioRecorder]) -> None:
+        """Register an audio recorder implementation.
+        
+        Args:
+            recorder_type: The name used to request this recorder.
+            recorder_class: The recorder class to instantiate.
+        """
+        _RECORDERS[recorder_type] = recorder_class
+    
+    @staticmethod
+    def register_player(player_type: str, player_class: Type[AudioPlayer]) -> None:
+        """Register an audio player implementation.
+        
+        Args:
+            player_type: The name used to request this player.
+            player_class: The player class to instantiate.
+        """
+        _PLAYERS[player_type] = player_class
+    
     @staticmethod
     def create_recorder(recorder_type: str, config: Dict[str, Any]) -> AudioRecorder:
         """Create an audio recorder instance.
@@ -244,11 +462,11 @@ class AudioIOFactory:
         Raises:
             ValueError: If the requested recorder type is not supported.
         """
-        if recorder_type == "mock":
-            return MockAudioRecorder(config)
-        # Additional recorder implementations would be added here
-        else:
-            raise ValueError(f"Unsupported audio recorder: {recorder_type}")
+        try:
+            recorder_class = _RECORDERS[recorder_type]
+        except KeyError:
+            raise ValueError(f"Unsupported audio recorder: {recorder_type}") from None
+        return recorder_class(config)
     
     @staticmethod
     def create_player(player_type: str, config: Dict[str, Any]) -> AudioPlayer:
@@ -264,8 +482,8 @@ class AudioIOFactory:
         Raises:
             ValueError: If the requested player type is not supported.
         """
-        if player_type == "mock":
-            return MockAudioPlayer(config)
-        # Additional player implementations would be added here
-        else:
-            raise ValueError(f"Unsupported audio player: {player_type}") 
\ No newline at end of file
+        try:
+            player_class = _PLAYERS[player_type]
+        except KeyError:
+            raise ValueError(f"Unsupported audio player: {player_type}") from None
+        return player_class(config)
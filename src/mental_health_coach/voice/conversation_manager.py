@@ -1,17 +1,172 @@
 """Voice conversation manager for the mental health coach application."""
 
+import io
 import os
+import atexit
+import shutil
+import asyncio
 import logging
+import weakref
 import threading
 import tempfile
-from typing import Optional, Callable, Dict, Any, List
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, Optional, Callable, Coroutine, Dict, Any, List
 
-from src.mental_health_coach.voice.audio_io import AudioRecorder, AudioPlayer, AudioIOFactory
-from src.mental_health_coach.voice.speech_to_text import SpeechToTextEngine, SpeechToTextFactory
-from src.mental_health_coach.voice.text_to_speech import TextToSpeechEngine, TextToSpeechFactory
+if TYPE_CHECKING:
+    from src.mental_health_coach.voice._batcher import MicroBatchingSTT
+    from src.mental_health_coach.voice.audio_io import AudioRecorder, AudioPlayer
+    from src.mental_health_coach.voice.speech_to_text import SpeechToTextEngine
+    from src.mental_health_coach.voice.text_to_speech import TextToSpeechEngine
 
 logger = logging.getLogger(__name__)
 
+# Per-process parent directory for the managers' temporary audio files
+_temp_root: Optional[str] = None
+_temp_root_lock = threading.Lock()
+
+
+def _release_engines(stt_engine: "SpeechToTextEngine", tts_engine: "TextToSpeechEngine",
+                     stt_batcher: "MicroBatchingSTT") -> None:
+    """Release a manager's references to the shared speech engines.
+    
+    Args:
+        stt_engine: The manager's speech-to-text engine.
+        tts_engine: The manager's text-to-speech engine.
+        stt_batcher: The manager's transcription batcher.
+    """
+    from src.mental_health_coach.voice._batcher import release_batcher
+    from src.mental_health_coach.voice.speech_to_text import SpeechToTextFactory
+    from src.mental_health_coach.voice.text_to_speech import TextToSpeechFactory
+    
+    # Shared engines are dropped with their last user
+    SpeechToTextFactory.release_engine(stt_engine)
+    TextToSpeechFactory.release_engine(tts_engine)
+    release_batcher(stt_batcher)
+
+
+def _get_temp_root() -> str:
+    """Get the per-process temporary directory, creating it on first use.
+    
+    Returns:
+        str: Path to the directory shared by all managers in this process.
+    """
+    global _temp_root
+    with _temp_root_lock:
+        if _temp_root is None:
+            _temp_root = tempfile.mkdtemp(prefix="mental_health_coach_")
+            atexit.register(shutil.rmtree, _temp_root, ignore_errors=True)
+        return _temp_root
+
+
+# Punctuation that ends a sentence in a committed transcript
+_SENTENCE_END = (".", "!", "?")
+
+# Event loop shared by every manager in this process. Recording and playback
+# sessions run on it as coroutines instead of each holding an OS thread.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+# Bounded pool for blocking speech-to-text, text-to-speech and callback work
+_executor = ThreadPoolExecutor(thread_name_prefix="voice-worker")
+
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """Get the shared event loop, starting its thread on first use.
+    
+    Returns:
+        asyncio.AbstractEventLoop: The loop running the managers' tasks.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="voice-event-loop", daemon=True
+            ).start()
+        return _loop
+
+
+async def _run_blocking(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a blocking function on the shared executor.
+    
+    Args:
+        func: The function to run.
+        *args: Positional arguments for the function.
+        
+    Returns:
+        Any: The function's return value.
+    """
+    return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+
+
+async def _invoke_callback(callback: Callable[..., Any], *args: Any) -> None:
+    """Invoke a user callback from the shared loop without blocking it.
+    
+    Coroutine functions are awaited on the loop; plain functions are run on
+    the executor, so existing synchronous callbacks keep working.
+    
+    Args:
+        callback: The callback to invoke.
+        *args: Positional arguments for the callback.
+    """
+    if asyncio.iscoroutinefunction(callback):
+        await callback(*args)
+    else:
+        await _run_blocking(callback, *args)
+
+
+def _wait_for(future: "Future[None]", timeout: float) -> None:
+    """Wait for a task submitted to the shared loop to finish.
+    
+    Args:
+        future: Future returned when the task was submitted.
+        timeout: Maximum number of seconds to wait.
+    """
+    try:
+        future.result(timeout=timeout)
+    except FutureTimeoutError:
+        logger.warning("Voice task did not finish within %s seconds", timeout)
+
+
+class _LocalAgreement:
+    """LocalAgreement-2 policy for streaming transcription hypotheses.
+    
+    A word is committed once two consecutive hypotheses agree on it, so the
+    partial transcripts passed on never repeat or retract committed text.
+    
+    Attributes:
+        committed: Words committed so far.
+    """
+    
+    def __init__(self) -> None:
+        """Initialize an empty agreement state."""
+        self.committed: List[str] = []
+        self._previous: List[str] = []
+    
+    def update(self, hypothesis: str) -> str:
+        """Add a new hypothesis and return any newly committed text.
+        
+        Args:
+            hypothesis: The engine's latest transcription of the audio so far.
+            
+        Returns:
+            str: Words committed by this hypothesis, or an empty string.
+        """
+        words = hypothesis.split()
+        agreed: List[str] = []
+        for previous_word, word in zip(self._previous, words):
+            if previous_word != word:
+                break
+            agreed.append(word)
+        self._previous = words
+        
+        if len(agreed) <= len(self.committed) or agreed[:len(self.committed)] != self.committed:
+            return ""
+        
+        new_words = agreed[len(self.committed):]
+        self.committed = agreed
+        return " ".join(new_words)
+
 
 class VoiceConversationManager:
     """Manager for voice-based conversations.
@@ -26,6 +181,8 @@ class VoiceConversationManager:
         tts_engine: Text-to-speech engine.
         config: Configuration dictionary for the conversation manager.
         on_transcription_complete: Callback function for transcription completion.
+        on_partial_transcription: Callback function for partial transcripts
+            produced while the user is still speaking.
         on_speech_complete: Callback function for speech synthesis completion.
         temp_dir: Directory for temporary audio files.
     """
@@ -43,39 +200,73 @@ class VoiceConversationManager:
                 - player_config: Configuration for the audio player.
                 - stt_config: Configuration for the speech-to-text engine.
                 - tts_config: Configuration for the text-to-speech engine.
+                - chunk_duration: Seconds of audio streamed to speech-to-text
+                  per chunk while recording (default 0.5).
+                - persist_recordings: Whether to also save each recording
+                  to a file in temp_dir (default False).
         """
+        # Import the voice backends on first use so that importing this module
+        # (e.g. transitively from the API) does not pay for them
+        from src.mental_health_coach.voice._batcher import acquire_batcher
+        from src.mental_health_coach.voice.audio_io import AudioIOFactory
+        from src.mental_health_coach.voice.speech_to_text import SpeechToTextFactory
+        from src.mental_health_coach.voice.text_to_speech import TextToSpeechFactory
+        
         self.config = config
         
         # Create audio I/O components
-        self.recorder = AudioIOFactory.create_recorder(
+        self.recorder: "AudioRecorder" = AudioIOFactory.create_recorder(
             config.get("recorder_type", "mock"),
             config.get("recorder_config", {})
         )
-        self.player = AudioIOFactory.create_player(
+        self.player: "AudioPlayer" = AudioIOFactory.create_player(
             config.get("player_type", "mock"),
             config.get("player_config", {})
         )
         
-        # Create speech processing engines
-        self.stt_engine = SpeechToTextFactory.create_engine(
+        # Create speech processing engines, sharing them between managers
+        # with the same configuration where the engine allows it
+        self.stt_engine: "SpeechToTextEngine" = SpeechToTextFactory.get_shared_engine(
             config.get("stt_engine_type", "mock"),
             config.get("stt_config", {})
         )
-        self.tts_engine = TextToSpeechFactory.create_engine(
+        self.tts_engine: "TextToSpeechEngine" = TextToSpeechFactory.get_shared_engine(
             config.get("tts_engine_type", "mock"),
             config.get("tts_config", {})
         )
         
-        # Set up temporary directory for audio files
-        self.temp_dir = tempfile.mkdtemp(prefix="mental_health_coach_")
+        # Finished recordings are transcribed in batches shared across managers
+        self._stt_batcher: "MicroBatchingSTT" = acquire_batcher(
+            config.get("stt_engine_type", "mock"),
+            config.get("stt_config", {})
+        )
+        
+        # Set up temporary directory for audio files; TemporaryDirectory also
+        # removes it if the manager is garbage collected without cleanup()
+        self._temp_dir_ctx = tempfile.TemporaryDirectory(
+            dir=_get_temp_root(), ignore_cleanup_errors=True
+        )
+        self.temp_dir = self._temp_dir_ctx.name
+        
+        # Likewise give the engines back to their caches on garbage collection
+        self._release_engines = weakref.finalize(
+            self, _release_engines, self.stt_engine, self.tts_engine, self._stt_batcher
+        )
         
         # Callback functions
         self.on_transcription_complete: Optional[Callable[[str], None]] = None
+        self.on_partial_transcription: Optional[Callable[[str], None]] = None
         self.on_speech_complete: Optional[Callable[[], None]] = None
         
-        # State variables
-        self._recording_thread: Optional[threading.Thread] = None
-        self._playback_thread: Optional[threading.Thread] = None
+        # State variables; recording and playback run as tasks on the shared loop
+        self._loop = _get_event_loop()
+        self._recording_task: Optional["Future[None]"] = None
+        self._playback_task: Optional["Future[None]"] = None
+        
+        # Signalled when the current recording should stop / playback has ended
+        self._stop_recording = asyncio.Event()
+        self._playback_done = asyncio.Event()
+        self.player.set_on_playback_complete(self._signal_playback_done)
     
     def start_listening(self) -> None:
         """Start listening for user speech.
@@ -87,36 +278,106 @@ class VoiceConversationManager:
             logger.warning("Already recording, ignoring start_listening call")
             return
         
-        def record_and_transcribe() -> None:
-            """Record audio and transcribe it."""
-            try:
-                # Start recording
-                self.recorder.start_recording()
-                
-                # Record until manually stopped
-                while self.recorder.is_recording():
-                    threading.Event().wait(0.1)  # Check every 100ms
+        # Start recording and hand the session to the shared event loop
+        self.recorder.start_recording()
+        self._stop_recording = asyncio.Event()
+        self._recording_task = self._submit(self._record_and_transcribe(self._stop_recording))
+    
+    async def _record_and_transcribe(self, stop: asyncio.Event) -> None:
+        """Record audio until stopped and transcribe it.
+        
+        Args:
+            stop: Event set when the recording should stop.
+        """
+        try:
+            if self.recorder.supports_chunks:
+                # Stream audio to speech-to-text until stop_listening signals us
+                await self._stream_until_stopped(stop)
+            else:
+                # Record until stop_listening signals us
+                await stop.wait()
+            
+            self.recorder.stop_recording()
+            
+            # Transcribe through the shared batcher, which coalesces this turn
+            # with any other conversation finishing at the same moment
+            audio_buffer = await _run_blocking(self._save_recording)
+            transcription = await asyncio.wrap_future(
+                self._stt_batcher.transcribe_async(audio_buffer)
+            )
+            
+            # Call the callback with the transcription result
+            if self.on_transcription_complete and transcription:
+                await _invoke_callback(self.on_transcription_complete, transcription)
+            
+        except Exception as e:
+            logger.error("Error in recording task: %s", e, exc_info=True)
+    
+    def _save_recording(self) -> io.BytesIO:
+        """Get the finished recording for transcription.
+        
+        The audio is kept in memory; it is only written to ``temp_dir``
+        when ``config["persist_recordings"]`` is set.
+        
+        Returns:
+            io.BytesIO: The recorded audio.
+        """
+        if self.config.get("persist_recordings", False):
+            fd, audio_path = tempfile.mkstemp(suffix=".wav", dir=self.temp_dir)
+            os.close(fd)
+            self.recorder.save_recording(audio_path)
+        
+        return self.recorder.save_to_buffer()
+    
+    async def _stream_until_stopped(self, stop: asyncio.Event) -> None:
+        """Feed recorded chunks to the speech-to-text engine until stopped.
+        
+        Partial transcripts committed by the LocalAgreement-2 policy are passed
+        to the on_partial_transcription callback as they become available.
+        Once a hypothesis has been committed in full and ends a sentence, the
+        audio it covered is confirmed so the stream can drop it.
+        
+        Args:
+            stop: Event set when the recording should stop.
+        """
+        chunk_duration = self.config.get("chunk_duration", 0.5)
+        agreement = _LocalAgreement()
+        
+        # Previous hypothesis and the buffer position it transcribed up to
+        previous_words: List[str] = []
+        previous_end = 0.0
+        
+        # One waiter for the whole session rather than a new task per tick
+        stop_waiter = asyncio.ensure_future(stop.wait())
+        
+        stream = self.stt_engine.start_streaming()
+        try:
+            while True:
+                await asyncio.wait((stop_waiter,), timeout=chunk_duration)
+                if stop_waiter.done():
+                    break
                 
-                # Get the recorded audio and save it to a temp file
-                audio_data = self.recorder.stop_recording()
-                temp_audio_path = os.path.join(self.temp_dir, "recording.wav")
-                self.recorder.save_recording(temp_audio_path)
+                chunk = self.recorder.read_chunk()
+                if not chunk:
+                    continue
                 
-                # Transcribe the audio
-                with open(temp_audio_path, "rb") as audio_file:
-                    transcription = self.stt_engine.transcribe_audio(audio_file)
+                hypothesis = await _run_blocking(stream.process_audio_chunk, chunk)
+                if hypothesis is None:
+                    continue
                 
-                # Call the callback with the transcription result
-                if self.on_transcription_complete and transcription:
-                    self.on_transcription_complete(transcription)
+                committed = agreement.update(hypothesis)
+                if (committed and agreement.committed == previous_words
+                        and committed.endswith(_SENTENCE_END)):
+                    stream.confirm(previous_end)
+                previous_words = hypothesis.split()
+                previous_end = stream.audio_buffer.end_time
                 
-            except Exception as e:
-                logger.error(f"Error in recording thread: {e}", exc_info=True)
-        
-        # Start the recording in a separate thread
-        self._recording_thread = threading.Thread(target=record_and_transcribe)
-        self._recording_thread.daemon = True
-        self._recording_thread.start()
+                if committed and self.on_partial_transcription:
+                    await _invoke_callback(self.on_partial_transcription, committed)
+        finally:
+            stop_waiter.cancel()
+            # Release the stream's buffered audio
+            stream.close()
     
     def stop_listening(self) -> None:
         """Stop listening for user speech.
@@ -127,13 +388,13 @@ class VoiceConversationManager:
             logger.warning("Not recording, ignoring stop_listening call")
             return
         
-        # Stop recording (the transcription will happen in the recording thread)
-        self.recorder.stop_recording()
+        # Wake the recording task; it stops the recorder and transcribes
+        self._loop.call_soon_threadsafe(self._stop_recording.set)
         
-        # Wait for the recording thread to complete
-        if self._recording_thread:
-            self._recording_thread.join(timeout=5.0)
-            self._recording_thread = None
+        # Wait for the recording task to complete
+        if self._recording_task:
+            _wait_for(self._recording_task, timeout=5.0)
+            self._recording_task = None
     
     def speak_response(self, text: str) -> None:
         """Speak a text response to the user.
@@ -144,35 +405,35 @@ class VoiceConversationManager:
         if self.player.is_playing():
             logger.warning("Already playing audio, stopping current playback")
             self.player.stop_playback()
+            self._loop.call_soon_threadsafe(self._playback_done.set)
         
-        def synthesize_and_play() -> None:
-            """Synthesize speech and play it."""
-            try:
-                # Synthesize speech
-                audio_data = self.tts_engine.synthesize_speech(text)
-                
-                # Save to a temp file
-                temp_audio_path = os.path.join(self.temp_dir, "response.wav")
-                self.tts_engine.save_to_file(text, temp_audio_path)
-                
-                # Play the audio
-                self.player.play_file(temp_audio_path)
-                
-                # Wait for playback to complete
-                while self.player.is_playing():
-                    threading.Event().wait(0.1)  # Check every 100ms
-                
-                # Call the callback when speech is complete
-                if self.on_speech_complete:
-                    self.on_speech_complete()
-                
-            except Exception as e:
-                logger.error(f"Error in playback thread: {e}", exc_info=True)
+        # Hand the playback to the shared event loop
+        self._playback_done = asyncio.Event()
+        self._playback_task = self._submit(self._synthesize_and_play(text, self._playback_done))
+    
+    async def _synthesize_and_play(self, text: str, done: asyncio.Event) -> None:
+        """Synthesize speech and play it.
         
-        # Start the playback in a separate thread
-        self._playback_thread = threading.Thread(target=synthesize_and_play)
-        self._playback_thread.daemon = True
-        self._playback_thread.start()
+        Args:
+            text: The text to speak.
+            done: Event set when playback has finished or been stopped.
+        """
+        try:
+            # Play synthesized audio as it is produced rather than after
+            # the whole response has been synthesized
+            await _run_blocking(
+                self.player.play_stream, self.tts_engine.synthesize_speech_stream(text)
+            )
+            
+            # Wait for the player (or stop_speaking) to signal completion
+            await done.wait()
+            
+            # Call the callback when speech is complete
+            if self.on_speech_complete:
+                await _invoke_callback(self.on_speech_complete)
+            
+        except Exception as e:
+            logger.error("Error in playback task: %s", e, exc_info=True)
     
     def stop_speaking(self) -> None:
         """Stop speaking the current response."""
@@ -180,13 +441,29 @@ class VoiceConversationManager:
             logger.warning("Not playing audio, ignoring stop_speaking call")
             return
         
-        # Stop playback
+        # Stop playback and release the playback task
         self.player.stop_playback()
+        self._loop.call_soon_threadsafe(self._playback_done.set)
         
-        # Wait for the playback thread to complete
-        if self._playback_thread:
-            self._playback_thread.join(timeout=5.0)
-            self._playback_thread = None
+        # Wait for the playback task to complete
+        if self._playback_task:
+            _wait_for(self._playback_task, timeout=5.0)
+            self._playback_task = None
+    
+    def _submit(self, coro: Coroutine[Any, Any, None]) -> "Future[None]":
+        """Schedule a coroutine on the shared event loop.
+        
+        Args:
+            coro: The coroutine to run.
+            
+        Returns:
+            Future[None]: Future completed when the coroutine finishes.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+    
+    def _signal_playback_done(self) -> None:
+        """Signal the current playback's completion from the player's thread."""
+        self._loop.call_soon_threadsafe(self._playback_done.set)
     
     def set_on_transcription_complete(self, callback: Callable[[str], None]) -> None:
         """Set the callback for transcription completion.
@@ -197,6 +474,15 @@ class VoiceConversationManager:
         """
         self.on_transcription_complete = callback
     
+    def set_on_partial_transcription(self, callback: Callable[[str], None]) -> None:
+        """Set the callback for partial transcripts.
+        
+        Args:
+            callback: Function to call with newly committed text while the
+                     user is still speaking.
+        """
+        self.on_partial_transcription = callback
+    
     def set_on_speech_complete(self, callback: Callable[[], None]) -> None:
         """Set the callback for speech synthesis completion.
         
@@ -214,16 +500,12 @@ class VoiceConversationManager:
         if self.player.is_playing():
             self.player.stop_playback()
         
-        # Clean up temporary files
-        for filename in os.listdir(self.temp_dir):
-            try:
-                file_path = os.path.join(self.temp_dir, filename)
-                if os.path.isfile(file_path):
-                    os.unlink(file_path)
-            except Exception as e:
-                logger.error(f"Error deleting temp file {filename}: {e}")
+        # Release any task still waiting on recording or playback
+        self._loop.call_soon_threadsafe(self._stop_recording.set)
+        self._loop.call_soon_threadsafe(self._playback_done.set)
         
-        try:
-            os.rmdir(self.temp_dir)
-        except Exception as e:
-            logger.error(f"Error removing temp directory {self.temp_dir}: {e}") 
\ No newline at end of file
+        # Release the engines; the finalizer runs at most once
+        self._release_engines()
+        
+        # Clean up temporary files
+        self._temp_dir_ctx.cleanup() 
\ No newline at end of file
@@ -3,10 +3,193 @@
 import os
 import logging
 from abc import ABC, abstractmethod
-from typing import Optional, BinaryIO, Dict, Any
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Iterator, Optional, BinaryIO, Dict, Any, List, Tuple, Type, TypeVar
+
+from src.mental_health_coach.voice._cache import EngineCache, config_key
+from src.mental_health_coach.voice._pool import POOL
 
 logger = logging.getLogger(__name__)
 
+# Fixed results returned by the mock engine
+_MOCK_TRANSCRIPT = "This is a mock transcription for testing purposes."
+_MOCK_STREAMING_TRANSCRIPT = "Mock streaming transcription result."
+
+
+class RollingAudioBuffer:
+    """Bounded buffer of the raw PCM audio awaiting transcription.
+    
+    Streaming engines re-transcribe the audio window on every chunk, so an
+    unbounded buffer makes each pass slower than the last. This buffer keeps
+    at most ``max_seconds`` of audio, and drops audio once its transcript is
+    confirmed. Positions are given in seconds since the stream started.
+    
+    Attributes:
+        sample_rate: Samples per second of the buffered audio.
+        sample_width: Bytes per sample.
+        max_bytes: Maximum number of bytes kept in the buffer.
+    """
+    
+    def __init__(self, sample_rate: int = 16000, sample_width: int = 2,
+                 max_seconds: float = 30.0) -> None:
+        """Initialize an empty buffer.
+        
+        Args:
+            sample_rate: Samples per second of the buffered audio.
+            sample_width: Bytes per sample.
+            max_seconds: Maximum seconds of audio to keep. Defaults to 30,
+                         the context length of Whisper-style models.
+        """
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.max_bytes = self._to_bytes(max_seconds)
+        self._chunks: Deque[bytes] = deque()
+        self._size = 0
+        # Stream position, in bytes, of the first buffered byte
+        self._offset = 0
+    
+    def _to_bytes(self, seconds: float) -> int:
+        """Convert a duration to a whole number of sample frames in bytes."""
+        return int(seconds * self.sample_rate) * self.sample_width
+    
+    @property
+    def start_time(self) -> float:
+        """float: Stream position of the oldest buffered audio, in seconds."""
+        return self._offset / (self.sample_rate * self.sample_width)
+    
+    @property
+    def end_time(self) -> float:
+        """float: Stream position of the end of the buffered audio, in seconds."""
+        return (self._offset + self._size) / (self.sample_rate * self.sample_width)
+    
+    def append(self, chunk: bytes) -> None:
+        """Add a chunk of audio, dropping the oldest audio beyond the budget.
+        
+        Args:
+            chunk: Raw PCM audio data.
+        """
+        self._chunks.append(chunk)
+        self._size += len(chunk)
+        if self._size > self.max_bytes:
+            self._drop(self._size - self.max_bytes)
+    
+    def trim_to_last_confirmed(self, timestamp: float) -> None:
+        """Drop all audio before a position whose transcript is confirmed.
+        
+        Args:
+            timestamp: Stream position, in seconds, up to which the
+                       transcript has been committed.
+        """
+        self._drop(self._to_bytes(timestamp) - self._offset)
+    
+    def _drop(self, count: int) -> None:
+        """Drop up to ``count`` bytes from the start of the buffer."""
+        count = min(count, self._size)
+        while count > 0:
+            chunk = self._chunks[0]
+            if len(chunk) <= count:
+                self._chunks.popleft()
+                dropped = len(chunk)
+            else:
+                self._chunks[0] = chunk[count:]
+                dropped = count
+            self._size -= dropped
+            self._offset += dropped
+            count -= dropped
+    
+    def window_bytes(self) -> bytes:
+        """Return the buffered audio as one contiguous block.
+        
+        Returns:
+            bytes: The audio currently in the window.
+        """
+        return b"".join(self._chunks)
+    
+    @contextmanager
+    def window_view(self) -> Iterator[memoryview]:
+        """Assemble the buffered audio in a pooled buffer.
+        
+        Streaming engines read the whole window on every chunk, so reusing
+        one buffer avoids allocating a fresh copy of it each time. The view
+        is only valid inside the ``with`` block, and nothing may keep an
+        export of it beyond the block.
+        
+        Yields:
+            memoryview: The audio currently in the window.
+        """
+        with POOL.acquire(self._size) as buffer:
+            offset = 0
+            for chunk in self._chunks:
+                buffer.view[offset:offset + len(chunk)] = chunk
+                offset += len(chunk)
+            yield buffer.view
+    
+    def clear(self) -> None:
+        """Empty the buffer and restart stream positions at zero."""
+        self._chunks.clear()
+        self._size = 0
+        self._offset = 0
+    
+    def __len__(self) -> int:
+        """Return the number of buffered bytes."""
+        return self._size
+
+
+class TranscriptionStream(ABC):
+    """One streaming transcription session on a speech-to-text engine.
+    
+    The stream holds all per-session state, so a single engine, and the
+    model it has loaded, can serve several conversations at once.
+    Implementations append each chunk to ``audio_buffer`` and transcribe its
+    window, so memory stays bounded however long the session.
+    
+    Attributes:
+        engine: The engine that transcribes the stream.
+        audio_buffer: Rolling buffer of streamed audio not yet confirmed.
+    """
+    
+    def __init__(self, engine: "SpeechToTextEngine") -> None:
+        """Start an empty stream.
+        
+        Args:
+            engine: The engine that transcribes the stream. Its config's
+                    optional ``sample_rate`` and ``buffer_seconds`` keys
+                    size the audio buffer.
+        """
+        self.engine = engine
+        self.audio_buffer = RollingAudioBuffer(
+            sample_rate=engine.config.get("sample_rate", 16000),
+            max_seconds=engine.config.get("buffer_seconds", 30.0),
+        )
+    
+    @abstractmethod
+    def process_audio_chunk(self, audio_chunk: bytes) -> Optional[str]:
+        """Process a chunk of audio data.
+        
+        Args:
+            audio_chunk: A chunk of audio data.
+            
+        Returns:
+            Optional[str]: Transcribed text if a complete utterance is detected,
+                           None otherwise.
+        """
+        pass
+    
+    def confirm(self, timestamp: float) -> None:
+        """Mark the transcript up to a stream position as committed.
+        
+        Audio before the position is no longer needed and is dropped.
+        
+        Args:
+            timestamp: Stream position, in seconds, of the committed text's end.
+        """
+        self.audio_buffer.trim_to_last_confirmed(timestamp)
+    
+    def close(self) -> None:
+        """End the stream and release its audio."""
+        self.audio_buffer.clear()
+
 
 class SpeechToTextEngine(ABC):
     """Abstract base class for speech-to-text engines.
@@ -16,8 +199,13 @@ class SpeechToTextEngine(ABC):
     
     Attributes:
         config: Configuration dictionary for the engine.
+        shareable: Whether one instance may serve several conversations.
+            Streaming state lives in ``TranscriptionStream`` objects, so
+            engines only need to be safe to call concurrently.
     """
     
+    shareable = True
+    
     def __init__(self, config: Dict[str, Any]) -> None:
         """Initialize the speech-to-text engine.
         
@@ -38,33 +226,53 @@ class SpeechToTextEngine(ABC):
         """
         pass
     
-    @abstractmethod
-    def start_streaming(self) -> None:
-        """Start streaming audio for real-time transcription.
+    def transcribe_batch(self, audio_files: List[BinaryIO]) -> List[str]:
+        """Transcribe several recordings at once.
         
-        This method initializes resources for streaming audio transcription.
-        """
-        pass
-    
-    @abstractmethod
-    def process_audio_chunk(self, audio_chunk: bytes) -> Optional[str]:
-        """Process a chunk of audio data in streaming mode.
+        Backends that can run a batch in a single inference call should
+        override this. The default transcribes the files one at a time.
         
         Args:
-            audio_chunk: A chunk of audio data.
+            audio_files: File-like objects containing audio data.
             
         Returns:
-            Optional[str]: Transcribed text if a complete utterance is detected,
-                           None otherwise.
+            List[str]: The transcribed text for each file, in order.
         """
-        pass
+        return [self.transcribe_audio(audio_file) for audio_file in audio_files]
     
     @abstractmethod
-    def stop_streaming(self) -> None:
-        """Stop streaming audio and release resources."""
+    def start_streaming(self) -> TranscriptionStream:
+        """Start streaming audio for real-time transcription.
+        
+        Returns:
+            TranscriptionStream: The new stream; close it when done.
+        """
         pass
 
 
+# Engine type name -> engine class
+_ENGINES: Dict[str, Type[SpeechToTextEngine]] = {}
+
+_EngineT = TypeVar("_EngineT", bound=Type[SpeechToTextEngine])
+
+
+def register_engine(engine_type: str) -> Callable[[_EngineT], _EngineT]:
+    """Class decorator that makes an engine available to the factory.
+    
+    Args:
+        engine_type: The name used to request the engine.
+        
+    Returns:
+        Callable: Decorator that registers the class and returns it unchanged.
+    """
+    def decorator(engine_class: _EngineT) -> _EngineT:
+        """Register the engine class."""
+        _ENGINES[engine_type] = engine_class
+        return engine_class
+    return decorator
+
+
+@register_engine("mock")
 class MockSpeechToTextEngine(SpeechToTextEngine):
     """Mock implementation of speech-to-text for testing purposes.
     
@@ -82,11 +290,20 @@ class MockSpeechToTextEngine(SpeechToTextEngine):
             str: A mock transcription.
         """
         logger.info("Mock STT: Transcribing audio file")
-        return "This is a mock transcription for testing purposes."
+        return _MOCK_TRANSCRIPT
     
-    def start_streaming(self) -> None:
-        """Initialize mock streaming session."""
+    def start_streaming(self) -> "MockTranscriptionStream":
+        """Start a mock streaming session.
+        
+        Returns:
+            MockTranscriptionStream: The new stream.
+        """
         logger.info("Mock STT: Starting streaming session")
+        return MockTranscriptionStream(self)
+
+
+class MockTranscriptionStream(TranscriptionStream):
+    """Streaming session of the mock speech-to-text engine."""
     
     def process_audio_chunk(self, audio_chunk: bytes) -> Optional[str]:
         """Return mock transcription for audio chunk.
@@ -97,21 +314,189 @@ class MockSpeechToTextEngine(SpeechToTextEngine):
         Returns:
             str: A mock transcription if the chunk is long enough.
         """
+        self.audio_buffer.append(audio_chunk)
+        
         # Simulate detecting a complete utterance based on chunk size
         if len(audio_chunk) > 1000:
-            return "Mock streaming transcription result."
+            return _MOCK_STREAMING_TRANSCRIPT
         return None
     
-    def stop_streaming(self) -> None:
+    def close(self) -> None:
         """Stop mock streaming session."""
         logger.info("Mock STT: Stopping streaming session")
+        super().close()
+
+
+# Supported ``quantization`` settings and the CTranslate2 compute types they
+# select. CTranslate2 has no 4-bit type, so "int4" is not offered.
+QUANTIZATION_COMPUTE_TYPES = {
+    "fp32": "float32",
+    "fp16": "float16",
+    "int8": "int8",
+}
+
+
+@register_engine("faster_whisper")
+class FasterWhisperSpeechToTextEngine(SpeechToTextEngine):
+    """Speech-to-text using faster-whisper (Whisper on CTranslate2).
+    
+    ``config["quantization"]`` selects the weight precision. The default
+    "int8" roughly halves memory bandwidth compared with fp16 on CPU, and uses
+    VNNI int8 dot products on AVX-512 hardware; "fp16" suits GPUs, and "fp32"
+    gives reference accuracy at the highest cost.
+    
+    One loaded model serves every stream started on the engine.
+    
+    Requires the optional ``faster-whisper`` package.
+    """
+    
+    def __init__(self, config: Dict[str, Any]) -> None:
+        """Load the Whisper model.
+        
+        Args:
+            config: Configuration dictionary with the optional keys
+                    ``model_size`` (default "base"), ``device`` (default
+                    "auto"), ``quantization`` (default "int8") and
+                    ``language`` (e.g. "en-US").
+                    
+        Raises:
+            ValueError: If the quantization setting is not supported.
+            ImportError: If faster-whisper is not installed.
+        """
+        super().__init__(config)
+        
+        quantization = config.get("quantization", "int8")
+        try:
+            compute_type = QUANTIZATION_COMPUTE_TYPES[quantization]
+        except KeyError:
+            raise ValueError(f"Unsupported quantization: {quantization}") from None
+        
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError as e:
+            raise ImportError(
+                "The faster_whisper engine requires the faster-whisper package"
+            ) from e
+        
+        self.model = WhisperModel(
+            config.get("model_size", "base"),
+            device=config.get("device", "auto"),
+            compute_type=compute_type,
+        )
+        
+        # Whisper takes bare language codes ("en"), not locales ("en-US")
+        language = config.get("language")
+        self.language = language.split("-")[0] if language else None
+    
+    def transcribe_audio(self, audio_file: BinaryIO) -> str:
+        """Transcribe audio data to text.
+        
+        Args:
+            audio_file: A file-like object containing audio data.
+            
+        Returns:
+            str: The transcribed text.
+        """
+        segments, _ = self.model.transcribe(audio_file, language=self.language)
+        return " ".join(segment.text.strip() for segment in segments)
+    
+    def start_streaming(self) -> "FasterWhisperTranscriptionStream":
+        """Start a new streaming session.
+        
+        Returns:
+            FasterWhisperTranscriptionStream: The new stream.
+        """
+        return FasterWhisperTranscriptionStream(self)
+
+
+class FasterWhisperTranscriptionStream(TranscriptionStream):
+    """Streaming session of the faster-whisper engine.
+    
+    Hypotheses cover the whole stream: words whose audio has been confirmed
+    and trimmed from ``audio_buffer`` are kept as a text prefix.
+    """
+    
+    engine: FasterWhisperSpeechToTextEngine
+    
+    def __init__(self, engine: FasterWhisperSpeechToTextEngine) -> None:
+        """Start an empty stream.
+        
+        Args:
+            engine: The engine whose model transcribes the stream.
+        """
+        super().__init__(engine)
+        
+        # Shortest window worth transcribing (0.5 seconds)
+        self._min_window_bytes = self.audio_buffer.sample_rate * self.audio_buffer.sample_width // 2
+        self._confirmed_words: List[str] = []
+        self._pending_words: List[Tuple[float, str]] = []
+    
+    def process_audio_chunk(self, audio_chunk: bytes) -> Optional[str]:
+        """Add a chunk of 16-bit PCM audio and transcribe the stream so far.
+        
+        Args:
+            audio_chunk: A chunk of audio data.
+            
+        Returns:
+            Optional[str]: The hypothesis for the whole stream, or None while
+                           there is too little audio to transcribe.
+        """
+        import numpy as np
+        
+        self.audio_buffer.append(audio_chunk)
+        if len(self.audio_buffer) < self._min_window_bytes:
+            return None
+        
+        # Convert inside the block; astype copies, so no view of the window
+        # outlives it
+        with self.audio_buffer.window_view() as window:
+            samples = np.frombuffer(window, dtype=np.int16).astype(np.float32)
+        segments, _ = self.engine.model.transcribe(
+            samples / 32768.0,
+            language=self.engine.language,
+            word_timestamps=True,
+            condition_on_previous_text=False,
+        )
+        
+        # Record each word's end as a stream position so confirm() can match it
+        offset = self.audio_buffer.start_time
+        self._pending_words = [
+            (offset + word.end, word.word.strip())
+            for segment in segments
+            for word in segment.words
+        ]
+        return " ".join(self._confirmed_words + [word for _, word in self._pending_words])
+    
+    def confirm(self, timestamp: float) -> None:
+        """Keep the words before a position as text and drop their audio.
+        
+        Args:
+            timestamp: Stream position, in seconds, of the committed text's end.
+        """
+        self._confirmed_words.extend(
+            word for end, word in self._pending_words if end <= timestamp
+        )
+        self._pending_words = [
+            (end, word) for end, word in self._pending_words if end > timestamp
+        ]
+        super().confirm(timestamp)
+    
+    def close(self) -> None:
+        """Stop streaming and release the session's audio."""
+        super().close()
+        self._pending_words = []
+
+
+# Engines shared between conversation managers
+_CACHE = EngineCache()
 
 
 class SpeechToTextFactory:
     """Factory for creating speech-to-text engine instances.
     
     This factory creates the appropriate speech-to-text engine based on
-    configuration settings.
+    configuration settings. Engines are made available with the
+    ``register_engine`` class decorator.
     """
     
     @staticmethod
@@ -119,7 +504,7 @@ class SpeechToTextFactory:
         """Create a speech-to-text engine instance.
         
         Args:
-            engine_type: The type of engine to create ("mock", "google", etc.).
+            engine_type: The type of engine to create ("mock", "faster_whisper", etc.).
             config: Configuration dictionary for the engine.
             
         Returns:
@@ -128,8 +513,44 @@ class SpeechToTextFactory:
         Raises:
             ValueError: If the requested engine type is not supported.
         """
-        if engine_type == "mock":
-            return MockSpeechToTextEngine(config)
-        # Additional engine implementations would be added here
-        else:
-            raise ValueError(f"Unsupported speech-to-text engine: {engine_type}") 
\ No newline at end of file
+        engine_class = _ENGINES.get(engine_type)
+        if engine_class is None:
+            raise ValueError(f"Unsupported speech-to-text engine: {engine_type}")
+        return engine_class(config)
+    
+    @staticmethod
+    def get_shared_engine(engine_type: str, config: Dict[str, Any]) -> SpeechToTextEngine:
+        """Get an engine, reusing the cached instance for the same type and config.
+        
+        Engines that are not ``shareable`` (or whose configuration is not
+        hashable) are created fresh on every call. Streams started on a
+        shared engine are independent of each other. Release the engine with
+        ``release_engine`` when it is no longer needed.
+        
+        Args:
+            engine_type: The type of engine to get.
+            config: Configuration dictionary for the engine.
+            
+        Returns:
+            SpeechToTextEngine: An instance of the requested engine type.
+            
+        Raises:
+            ValueError: If the requested engine type is not supported.
+        """
+        key = config_key(engine_type, config)
+        if key is None:
+            return SpeechToTextFactory.create_engine(engine_type, config)
+        
+        engine, _ = _CACHE.acquire(key, lambda: SpeechToTextFactory.create_engine(engine_type, config))
+        return engine
+    
+    @staticmethod
+    def release_engine(engine: SpeechToTextEngine) -> None:
+        """Release an engine obtained from ``get_shared_engine``.
+        
+        The cached instance is dropped once its last user releases it.
+        
+        Args:
+            engine: The engine to release.
+        """
+        _CACHE.release(engine)
@@ -1,12 +1,21 @@
 """Text-to-speech functionality for voice conversations."""
 
 import os
+import re
 import logging
 from abc import ABC, abstractmethod
-from typing import Optional, BinaryIO, Dict, Any
+from typing import Callable, Optional, BinaryIO, Dict, Any, Iterator, Type, TypeVar
+
+from src.mental_health_coach.voice._cache import EngineCache, config_key
 
 logger = logging.getLogger(__name__)
 
+# Sentence boundaries used to chunk streamed mock synthesis
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# Audio returned by the mock engine
+_EMPTY = b""
+
 
 class TextToSpeechEngine(ABC):
     """Abstract base class for text-to-speech engines.
@@ -16,8 +25,13 @@ class TextToSpeechEngine(ABC):
     
     Attributes:
         config: Configuration dictionary for the engine.
+        shareable: Whether one instance may serve several conversations.
+            Shared engines must be safe to call concurrently, and
+            ``set_voice`` on a shared engine affects all of its users.
     """
     
+    shareable = True
+    
     def __init__(self, config: Dict[str, Any]) -> None:
         """Initialize the text-to-speech engine.
         
@@ -38,6 +52,21 @@ class TextToSpeechEngine(ABC):
         """
         pass
     
+    def synthesize_speech_stream(self, text: str) -> Iterator[bytes]:
+        """Synthesize speech from text, yielding audio as it is produced.
+        
+        Engines that can stream should override this so playback can start
+        before the whole text is synthesized. The default yields the complete
+        result of ``synthesize_speech`` as a single chunk.
+        
+        Args:
+            text: The text to convert to speech.
+            
+        Yields:
+            bytes: Successive chunks of synthesized audio data.
+        """
+        yield self.synthesize_speech(text)
+    
     @abstractmethod
     def save_to_file(self, text: str, output_file: str) -> None:
         """Synthesize speech and save to a file.
@@ -67,6 +96,29 @@ class TextToSpeechEngine(ABC):
         pass
 
 
+# Engine type name -> engine class
+_ENGINES: Dict[str, Type[TextToSpeechEngine]] = {}
+
+_EngineT = TypeVar("_EngineT", bound=Type[TextToSpeechEngine])
+
+
+def register_engine(engine_type: str) -> Callable[[_EngineT], _EngineT]:
+    """Class decorator that makes an engine available to the factory.
+    
+    Args:
+        engine_type: The name used to request the engine.
+        
+    Returns:
+        Callable: Decorator that registers the class and returns it unchanged.
+    """
+    def decorator(engine_class: _EngineT) -> _EngineT:
+        """Register the engine class."""
+        _ENGINES[engine_type] = engine_class
+        return engine_class
+    return decorator
+
+
+@register_engine("mock")
 class MockTextToSpeechEngine(TextToSpeechEngine):
     """Mock implementation of text-to-speech for testing purposes.
     
@@ -83,9 +135,24 @@ class MockTextToSpeechEngine(TextToSpeechEngine):
         Returns:
             bytes: Empty bytes representing mock audio data.
         """
-        logger.info(f"Mock TTS: Synthesizing speech for text: {text[:20]}...")
+        # Skip building the log record on this hot path unless it is emitted
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Mock TTS: Synthesizing speech for %d characters", len(text))
         # Return empty bytes as mock audio data
-        return b""
+        return _EMPTY
+    
+    def synthesize_speech_stream(self, text: str) -> Iterator[bytes]:
+        """Yield mock audio data one sentence at a time.
+        
+        Args:
+            text: The text to convert to speech.
+            
+        Yields:
+            bytes: Empty bytes for each sentence of the text.
+        """
+        for sentence in _SENTENCE_END.split(text):
+            if sentence:
+                yield self.synthesize_speech(sentence)
     
     def save_to_file(self, text: str, output_file: str) -> None:
         """Mock saving synthesized speech to a file.
@@ -94,10 +161,9 @@ class MockTextToSpeechEngine(TextToSpeechEngine):
             text: The text to convert to speech.
             output_file: Path to the output audio file.
         """
-        logger.info(f"Mock TTS: Saving speech to file: {output_file}")
-        # Create an empty file
-        with open(output_file, "wb") as f:
-            f.write(b"")
+        logger.info("Mock TTS: Saving speech to file: %s", output_file)
+        # Create an empty file; there is nothing to write
+        open(output_file, "wb").close()
     
     def get_available_voices(self) -> Dict[str, Any]:
         """Return mock voice options.
@@ -116,14 +182,19 @@ class MockTextToSpeechEngine(TextToSpeechEngine):
         Args:
             voice_id: Identifier for the voice to use.
         """
-        logger.info(f"Mock TTS: Setting voice to {voice_id}")
+        logger.info("Mock TTS: Setting voice to %s", voice_id)
+
+
+# Engines shared between conversation managers
+_CACHE = EngineCache()
 
 
 class TextToSpeechFactory:
     """Factory for creating text-to-speech engine instances.
     
     This factory creates the appropriate text-to-speech engine based on
-    configuration settings.
+    configuration settings. Engines are made available with the
+    ``register_engine`` class decorator.
     """
     
     @staticmethod
@@ -140,8 +211,43 @@ class TextToSpeechFactory:
         Raises:
             ValueError: If the requested engine type is not supported.
         """
-        if engine_type == "mock":
-            return MockTextToSpeechEngine(config)
-        # Additional engine implementations would be added here
-        else:
-            raise ValueError(f"Unsupported text-to-speech engine: {engine_type}") 
\ No newline at end of file
+        engine_class = _ENGINES.get(engine_type)
+        if engine_class is None:
+            raise ValueError(f"Unsupported text-to-speech engine: {engine_type}")
+        return engine_class(config)
+    
+    @staticmethod
+    def get_shared_engine(engine_type: str, config: Dict[str, Any]) -> TextToSpeechEngine:
+        """Get an engine, reusing the cached instance for the same type and config.
+        
+        Engines that are not ``shareable`` (or whose configuration is not
+        hashable) are created fresh on every call. Release the engine with
+        ``release_engine`` when it is no longer needed.
+        
+        Args:
+            engine_type: The type of engine to get.
+            config: Configuration dictionary for the engine.
+            
+        Returns:
+            TextToSpeechEngine: An instance of the requested engine type.
+            
+        Raises:
+            ValueError: If the requested engine type is not supported.
+        """
+        key = config_key(engine_type, config)
+        if key is None:
+            return TextToSpeechFactory.create_engine(engine_type, config)
+        
+        engine, _ = _CACHE.acquire(key, lambda: TextToSpeechFactory.create_engine(engine_type, config))
+        return engine
+    
+    @staticmethod
+    def release_engine(engine: TextToSpeechEngine) -> None:
+        """Release an engine obtained from ``get_shared_engine``.
+        
+        The cached instance is dropped once its last user releases it.
+        
+        Args:
+            engine: The engine to release.
+        """
+        _CACHE.release(engine)
@@ -0,0 +1,99 @@
+"""Shared fixtures for the API tests.
+
+This module provides the authenticated test user and client used across the
+API test modules.
+"""
+
+from typing import Callable, Dict, Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.mental_health_coach.models.user import User
+
+
+@pytest.fixture
+def user(
+    db: Session, user_factory: Callable[..., User], hashed_test_password: str
+) -> User:
+    """Create a test user who can log in with the test password.
+    
+    The user is committed so it survives endpoints that roll back the
+    request's session on error.
+    
+    Args:
+        db: Database session.
+        user_factory: Session-wide user factory.
+        hashed_test_password: Session-wide hash of the test password.
+        
+    Returns:
+        User: Test user.
+    """
+    user = user_factory(db, hashed_password=hashed_test_password)
+    db.commit()
+    return user
+
+
+@pytest.fixture(scope="module")
+def module_user(
+    module_db: Session, user_factory: Callable[..., User], hashed_test_password: str
+) -> User:
+    """Create a test user shared by every test in a module.
+    
+    Args:
+        module_db: Module-scoped database session.
+        user_factory: Session-wide user factory.
+        hashed_test_password: Session-wide hash of the test password.
+        
+    Returns:
+        User: Test user.
+    """
+    user = user_factory(module_db, hashed_password=hashed_test_password)
+    module_db.commit()
+    return user
+
+
+@pytest.fixture
+def user_token(user: User, access_token_for: Callable[[str], str]) -> str:
+    """Create a token for the test user.
+    
+    Args:
+        user: Test user.
+        access_token_for: Session-wide token cache.
+        
+    Returns:
+        str: Access token for the user.
+    """
+    return access_token_for(user.email)
+
+
+@pytest.fixture
+def auth_headers(user_token: str) -> Dict[str, str]:
+    """Create authorization headers with the user token.
+    
+    Args:
+        user_token: Access token for the user.
+        
+    Returns:
+        Dict[str, str]: Headers with authorization token.
+    """
+    return {"Authorization": f"Bearer {user_token}"}
+
+
+@pytest.fixture
+def auth_client(client: TestClient, auth_headers: Dict[str, str]) -> Iterator[TestClient]:
+    """Authenticate the shared test client as the test user for one test.
+    
+    Args:
+        client: The session-wide test client.
+        auth_headers: Headers with authorization token.
+        
+    Returns:
+        TestClient: The client, sending the user's token on every request.
+    """
+    client.headers.update(auth_headers)
+    try:
+        yield client
+    finally:
+        client.headers.pop("Authorization", None)
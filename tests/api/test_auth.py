@@ -4,9 +4,8 @@ from typing import TYPE_CHECKING
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy.orm import Session
 
-from src.mental_health_coach.auth.security import get_password_hash
+from src.mental_health_coach.auth.security import get_password_hash, verify_password
 from src.mental_health_coach.models.user import User
 
 if TYPE_CHECKING:
@@ -17,31 +16,6 @@ if TYPE_CHECKING:
     from pytest_mock.plugin import MockerFixture
 
 
-@pytest.fixture
-def user(db: Session) -> User:
-    """Create a test user.
-    
-    Args:
-        db: Database session.
-        
-    Returns:
-        User: Test user.
-    """
-    # Create user with known password
-    password = "password123"
-    hashed_password = get_password_hash(password)
-    user = User(
-        email="test@example.com",
-        hashed_password=hashed_password,
-        first_name="Test",
-        last_name="User",
-    )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
-
-
 def test_login_valid_credentials(client: TestClient, user: User) -> None:
     """Test logging in with valid credentials.
     
@@ -109,4 +83,14 @@ def test_login_invalid_password(client: TestClient, user: User) -> None:
     assert response.status_code == 401
     data = response.json()
     assert "detail" in data
-    assert "Incorrect email or password" in data["detail"] 
\ No newline at end of file
+    assert "Incorrect email or password" in data["detail"] 
+
+
+@pytest.mark.usefixtures("real_password_hashing")
+def test_password_hashing_uses_bcrypt() -> None:
+    """Test that passwords are hashed and verified with the real bcrypt scheme."""
+    hashed_password = get_password_hash("password123")
+    
+    assert hashed_password.startswith("$2b$")
+    assert verify_password("password123", hashed_password)
+    assert not verify_password("wrongpassword", hashed_password)
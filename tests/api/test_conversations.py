@@ -6,7 +6,6 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
-from src.mental_health_coach.auth.security import get_password_hash, create_access_token
 from src.mental_health_coach.models.user import User
 
 if TYPE_CHECKING:
@@ -17,61 +16,11 @@ if TYPE_CHECKING:
     from pytest_mock.plugin import MockerFixture
 
 
-@pytest.fixture
-def user(db: Session) -> User:
-    """Create a test user.
-    
-    Args:
-        db: Database session.
-        
-    Returns:
-        User: Test user.
-    """
-    hashed_password = get_password_hash("password123")
-    user = User(
-        email="test@example.com",
-        hashed_password=hashed_password,
-        first_name="Test",
-        last_name="User",
-    )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
-
-
-@pytest.fixture
-def user_token(user: User) -> str:
-    """Create a token for the test user.
-    
-    Args:
-        user: Test user.
-        
-    Returns:
-        str: Access token for the user.
-    """
-    return create_access_token(data={"sub": user.email})
-
-
-@pytest.fixture
-def auth_headers(user_token: str) -> dict:
-    """Create authorization headers with the user token.
-    
-    Args:
-        user_token: Access token for the user.
-        
-    Returns:
-        dict: Headers with authorization token.
-    """
-    return {"Authorization": f"Bearer {user_token}"}
-
-
-def test_create_conversation(client: TestClient, auth_headers: dict) -> None:
+def test_create_conversation(auth_client: TestClient) -> None:
     """Test creating a conversation.
     
     Args:
-        client: Test client.
-        auth_headers: Headers with authorization token.
+        auth_client: Authenticated test client.
     """
     # Test data
     conversation_data = {
@@ -81,8 +30,8 @@ def test_create_conversation(client: TestClient, auth_headers: dict) -> None:
     }
     
     # Make the request
-    response = client.post(
-        "/api/conversations/", json=conversation_data, headers=auth_headers
+    response = auth_client.post(
+        "/api/conversations/", json=conversation_data
     )
     
     # Check the response
@@ -98,26 +47,24 @@ def test_create_conversation(client: TestClient, auth_headers: dict) -> None:
     assert data["ended_at"] is None
 
 
-def test_get_conversations(client: TestClient, auth_headers: dict, db: Session, user: User) -> None:
+def test_get_conversations(auth_client: TestClient, db: Session, user: User) -> None:
     """Test getting all conversations for a user.
     
     Args:
-        client: Test client.
-        auth_headers: Headers with authorization token.
+        auth_client: Authenticated test client.
         db: Database session.
         user: Test user.
     """
     # First, create some conversations for the user
     for i in range(3):
-        response = client.post(
+        response = auth_client.post(
             "/api/conversations/",
             json={"title": f"Test Conversation {i}"},
-            headers=auth_headers,
         )
         assert response.status_code == 201
     
     # Make the request to get all conversations
-    response = client.get("/api/conversations/", headers=auth_headers)
+    response = auth_client.get("/api/conversations/")
     
     # Check the response
     assert response.status_code == 200
@@ -134,16 +81,15 @@ def test_get_conversations(client: TestClient, auth_headers: dict, db: Session,
         assert "started_at" in conversation
 
 
-def test_create_message(client: TestClient, auth_headers: dict) -> None:
+def test_create_message(auth_client: TestClient) -> None:
     """Test creating a message in a conversation.
     
     Args:
-        client: Test client.
-        auth_headers: Headers with authorization token.
+        auth_client: Authenticated test client.
     """
     # First, create a conversation
-    conversation_response = client.post(
-        "/api/conversations/", json={"title": "Test Conversation"}, headers=auth_headers
+    conversation_response = auth_client.post(
+        "/api/conversations/", json={"title": "Test Conversation"}
     )
     assert conversation_response.status_code == 201
     conversation_id = conversation_response.json()["id"]
@@ -155,10 +101,9 @@ def test_create_message(client: TestClient, auth_headers: dict) -> None:
     }
     
     # Make the request
-    response = client.post(
+    response = auth_client.post(
         f"/api/conversations/{conversation_id}/messages",
         json=message_data,
-        headers=auth_headers,
     )
     
     # Check the response
@@ -172,12 +117,11 @@ def test_create_message(client: TestClient, auth_headers: dict) -> None:
     assert data["message"]["conversation_id"] == conversation_id
 
 
-def test_create_important_memory(client: TestClient, auth_headers: dict) -> None:
+def test_create_important_memory(auth_client: TestClient) -> None:
     """Test creating an important memory.
     
     Args:
-        client: Test client.
-        auth_headers: Headers with authorization token.
+        auth_client: Authenticated test client.
     """
     # Test data
     memory_data = {
@@ -187,8 +131,8 @@ def test_create_important_memory(client: TestClient, auth_headers: dict) -> None
     }
     
     # Make the request
-    response = client.post(
-        "/api/conversations/memories", json=memory_data, headers=auth_headers
+    response = auth_client.post(
+        "/api/conversations/memories", json=memory_data
     )
     
     # Check the response
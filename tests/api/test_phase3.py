@@ -1,16 +1,15 @@
 """Tests for Phase 3 functionality."""
 
-from typing import TYPE_CHECKING, Dict, Any
-from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
 
 import pytest
 from fastapi.testclient import TestClient
+from freezegun import freeze_time
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from src.mental_health_coach.models.user import User, UserProfile, SessionSchedule
 from src.mental_health_coach.models.conversation import Conversation, Message
-from src.mental_health_coach.auth.security import create_access_token, get_password_hash
-from src.mental_health_coach.services.crisis_detection import CrisisDetector
 
 if TYPE_CHECKING:
     from _pytest.capture import CaptureFixture
@@ -20,89 +19,76 @@ if TYPE_CHECKING:
     from pytest_mock.plugin import MockerFixture
 
 
-@pytest.fixture
-def user(db: Session) -> User:
-    """Create a test user with profile and session schedules.
+@pytest.fixture(autouse=True)
+def db(nested_db: Session) -> Session:
+    """Run each test on top of the module's seeded data.
     
     Args:
-        db: Database session.
+        nested_db: Per-test session nested in the module session.
         
     Returns:
-        User: The test user.
+        Session: Database session for the test.
     """
-    # Create user
-    hashed_password = get_password_hash("password123")
-    user = User(
-        email="test@example.com",
-        hashed_password=hashed_password,
-        first_name="Test",
-        last_name="User",
-    )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    
-    # Create profile
-    profile = UserProfile(
-        user_id=user.id,
-        age=30,
-        location="Test City",
-        anxiety_score=5,
-        depression_score=3,
-        communication_preference="text",
-        session_frequency=2,
-    )
-    db.add(profile)
-    db.commit()
-    
-    # Create session schedules
-    schedule1 = SessionSchedule(
-        user_id=user.id,
-        day_of_week=1,  # Tuesday
-        hour=14,
-        minute=30,
-        is_active=True,
-    )
-    schedule2 = SessionSchedule(
-        user_id=user.id,
-        day_of_week=4,  # Friday
-        hour=10,
-        minute=0,
-        is_active=True,
-    )
-    db.add(schedule1)
-    db.add(schedule2)
-    db.commit()
+    return nested_db
+
+
+@pytest.fixture(scope="module")
+def user(module_user: User) -> User:
+    """Share one test user across the module.
     
-    return user
+    Args:
+        module_user: Module-scoped test user.
+        
+    Returns:
+        User: Test user.
+    """
+    return module_user
 
 
-@pytest.fixture
-def user_token(user: User) -> str:
-    """Create a token for the test user.
+@pytest.fixture(scope="module")
+def user_with_schedule(module_db: Session, user: User) -> User:
+    """Give the test user a profile and session schedules.
     
     Args:
+        module_db: Module-scoped database session.
         user: The test user.
         
     Returns:
-        str: The access token.
+        User: The test user.
     """
-    return create_access_token(data={"sub": user.email})
+    # Seed the rows with bulk inserts; the tests only read them back
+    # through the endpoints, so no ORM instances are needed
+    module_db.execute(insert(UserProfile), [
+        {
+            "user_id": user.id,
+            "age": 30,
+            "location": "Test City",
+            "anxiety_score": 5,
+            "depression_score": 3,
+            "communication_preference": "text",
+            "session_frequency": 2,
+        },
+    ])
+    module_db.execute(insert(SessionSchedule), [
+        {"user_id": user.id, "day_of_week": 1, "hour": 14, "minute": 30, "is_active": True},  # Tuesday
+        {"user_id": user.id, "day_of_week": 4, "hour": 10, "minute": 0, "is_active": True},  # Friday
+    ])
+    module_db.commit()
+    
+    return user
 
 
-def test_session_schedule_endpoints(client: TestClient, user: User, user_token: str, db: Session) -> None:
+def test_session_schedule_endpoints(auth_client: TestClient, user_with_schedule: User, db: Session) -> None:
     """Test the session schedule endpoints.
     
     Args:
-        client: The test client.
-        user: The test user.
-        user_token: The access token for the test user.
+        auth_client: The authenticated test client.
+        user_with_schedule: The test user, with profile and schedules.
         db: The database session.
     """
     # Test getting session schedules
-    response = client.get(
+    response = auth_client.get(
         "/api/users/me/schedule",
-        headers={"Authorization": f"Bearer {user_token}"},
     )
     assert response.status_code == 200
     data = response.json()
@@ -111,9 +97,8 @@ def test_session_schedule_endpoints(client: TestClient, user: User, user_token:
     assert data[1]["day_of_week"] == 4  # Friday
     
     # Test creating a new session schedule
-    response = client.post(
+    response = auth_client.post(
         "/api/users/me/schedule",
-        headers={"Authorization": f"Bearer {user_token}"},
         json={
             "day_of_week": 2,  # Wednesday
             "hour": 15,
@@ -128,9 +113,8 @@ def test_session_schedule_endpoints(client: TestClient, user: User, user_token:
     new_schedule_id = data["id"]
     
     # Test updating a session schedule
-    response = client.put(
+    response = auth_client.put(
         f"/api/users/me/schedule/{new_schedule_id}",
-        headers={"Authorization": f"Bearer {user_token}"},
         json={
             "day_of_week": 3,  # Thursday
             "hour": 16,
@@ -144,81 +128,98 @@ def test_session_schedule_endpoints(client: TestClient, user: User, user_token:
     assert data["minute"] == 30
     
     # Verify in database
-    db_schedule = db.query(SessionSchedule).filter(SessionSchedule.id == new_schedule_id).first()
+    db_schedule = db.get(SessionSchedule, new_schedule_id)
     assert db_schedule is not None
     assert db_schedule.day_of_week == 3
     assert db_schedule.hour == 16
     assert db_schedule.minute == 30
     
     # Test deleting a session schedule
-    response = client.delete(
+    response = auth_client.delete(
         f"/api/users/me/schedule/{new_schedule_id}",
-        headers={"Authorization": f"Bearer {user_token}"},
     )
     assert response.status_code == 204
     
     # Verify in database
-    db_schedule = db.query(SessionSchedule).filter(SessionSchedule.id == new_schedule_id).first()
+    db_schedule = db.get(SessionSchedule, new_schedule_id)
     assert db_schedule is not None
     assert db_schedule.is_active is False
 
 
-def test_crisis_detection_endpoint(client: TestClient, user: User, user_token: str, db: Session) -> None:
-    """Test the crisis detection endpoint.
+@pytest.fixture(scope="module")
+def conversation(module_db: Session, user_with_schedule: User) -> Conversation:
+    """Create a formal session conversation shared by the module.
     
     Args:
-        client: The test client.
-        user: The test user.
-        user_token: The access token for the test user.
-        db: The database session.
+        module_db: Module-scoped database session.
+        user_with_schedule: The test user, with profile and schedules.
+        
+    Returns:
+        Conversation: The created conversation.
     """
-    # Create a conversation
     conversation = Conversation(
-        user_id=user.id,
+        user_id=user_with_schedule.id,
         title="Test Conversation",
-        is_formal_session=False,
+        is_formal_session=True,
+        session_number=1,
     )
-    db.add(conversation)
-    db.commit()
-    db.refresh(conversation)
+    module_db.add(conversation)
+    module_db.commit()
+    return conversation
+
+
+@pytest.mark.parametrize(
+    "content, is_crisis",
+    [
+        ("I'm feeling okay today, just a bit tired.", False),
+        # Explicitly uses keywords from CRISIS_KEYWORDS
+        ("I want to kill myself. I don't see any reason to live anymore.", True),
+    ],
+    ids=["non_crisis", "crisis"],
+)
+def test_crisis_detection_endpoint(
+    auth_client: TestClient,
+    conversation: Conversation,
+    content: str,
+    is_crisis: bool,
+) -> None:
+    """Test crisis detection on posted conversation messages.
     
-    # Test with non-crisis message
-    response = client.post(
+    Args:
+        auth_client: The authenticated test client.
+        conversation: The conversation to post into.
+        content: Message content to send.
+        is_crisis: Whether the message should be treated as a crisis.
+    """
+    response = auth_client.post(
         f"/api/conversations/{conversation.id}/messages",
-        headers={"Authorization": f"Bearer {user_token}"},
         json={
             "is_from_user": True,
-            "content": "I'm feeling okay today, just a bit tired.",
+            "content": content,
         },
     )
     assert response.status_code == 201
     data = response.json()
     assert "message" in data
     assert data["message"]["is_from_user"] is True
-    assert data["crisis_info"] is None
     
-    # Test with crisis message that explicitly uses keywords from CRISIS_KEYWORDS
-    response = client.post(
-        f"/api/conversations/{conversation.id}/messages",
-        headers={"Authorization": f"Bearer {user_token}"},
-        json={
-            "is_from_user": True,
-            "content": "I want to kill myself. I don't see any reason to live anymore.",
-        },
-    )
-    assert response.status_code == 201
-    data = response.json()
-    assert "message" in data
-    assert data["message"]["is_from_user"] is True
-    assert data["crisis_info"] is not None
-    assert data["crisis_info"]["is_crisis"] is True
-    assert "suicide" in data["crisis_info"]["categories"]
-    assert "ai_response" in data["crisis_info"]
+    assert data["crisis_detected"] is is_crisis
+    assert data["ai_message"]["is_from_user"] is False
+    
+    if is_crisis:
+        assert data["crisis_resources"]
+    else:
+        assert "crisis_resources" not in data
+
+
+def test_crisis_analyze_endpoint(auth_client: TestClient) -> None:
+    """Test the crisis analysis endpoint.
     
-    # Test crisis analysis endpoint
-    response = client.post(
+    Args:
+        auth_client: The authenticated test client.
+    """
+    response = auth_client.post(
         "/api/crisis/analyze",
-        headers={"Authorization": f"Bearer {user_token}"},
         json={
             "message": "I've been feeling very anxious and can't stop having panic attacks.",
         },
@@ -228,11 +229,16 @@ def test_crisis_detection_endpoint(client: TestClient, user: User, user_token: s
     assert data["is_crisis"] is True
     assert "severe_anxiety" in data["categories"]
     assert len(data["resources"]) > 0
+
+
+def test_crisis_resources_endpoint(auth_client: TestClient) -> None:
+    """Test the crisis resources endpoint.
     
-    # Test crisis resources endpoint
-    response = client.get(
+    Args:
+        auth_client: The authenticated test client.
+    """
+    response = auth_client.get(
         "/api/crisis/resources/suicide",
-        headers={"Authorization": f"Bearer {user_token}"},
     )
     assert response.status_code == 200
     data = response.json()
@@ -240,40 +246,31 @@ def test_crisis_detection_endpoint(client: TestClient, user: User, user_token: s
     assert data[0]["name"] == "National Suicide Prevention Lifeline"
 
 
-def test_dashboard_endpoints(client: TestClient, user: User, user_token: str, db: Session) -> None:
+# 2024-01-01 is a Monday, so the seeded Tuesday and Friday schedules are
+# exactly 1 and 4 days away
+@freeze_time("2024-01-01 12:00:00")
+def test_dashboard_endpoints(auth_client: TestClient, db: Session, conversation: Conversation) -> None:
     """Test the dashboard endpoints.
     
     Args:
-        client: The test client.
-        user: The test user.
-        user_token: The access token for the test user.
+        auth_client: The authenticated test client.
         db: The database session.
+        conversation: The shared formal session conversation.
     """
-    # Create a conversation with messages
-    conversation = Conversation(
-        user_id=user.id,
-        title="Test Conversation",
-        is_formal_session=True,
-        session_number=1,
-    )
-    db.add(conversation)
-    db.commit()
-    db.refresh(conversation)
-    
-    # Add messages
-    for i in range(5):
-        message = Message(
+    # Add messages to the conversation
+    db.add_all([
+        Message(
             conversation_id=conversation.id,
             is_from_user=i % 2 == 0,
             content=f"Test message {i}",
         )
-        db.add(message)
+        for i in range(5)
+    ])
     db.commit()
     
     # Test dashboard data endpoint
-    response = client.get(
+    response = auth_client.get(
         "/api/dashboard/me",
-        headers={"Authorization": f"Bearer {user_token}"},
     )
     assert response.status_code == 200
     data = response.json()
@@ -284,9 +281,8 @@ def test_dashboard_endpoints(client: TestClient, user: User, user_token: str, db
     assert "upcoming_sessions" in data
     
     # Test session stats endpoint
-    response = client.get(
+    response = auth_client.get(
         "/api/dashboard/me/session-stats",
-        headers={"Authorization": f"Bearer {user_token}"},
     )
     assert response.status_code == 200
     data = response.json()
@@ -294,13 +290,12 @@ def test_dashboard_endpoints(client: TestClient, user: User, user_token: str, db
     assert "avg_messages_per_session" in data
     
     # Test upcoming sessions endpoint
-    response = client.get(
+    response = auth_client.get(
         "/api/dashboard/me/upcoming-sessions",
-        headers={"Authorization": f"Bearer {user_token}"},
     )
     assert response.status_code == 200
     data = response.json()
-    assert len(data) > 0
-    assert "day" in data[0]
-    assert "time" in data[0]
-    assert "days_until" in data[0] 
\ No newline at end of file
+    assert [(session["day"], session["time"], session["days_until"]) for session in data] == [
+        ("Tuesday", "14:30", 1),
+        ("Friday", "10:00", 4),
+    ] 
\ No newline at end of file
@@ -1,18 +1,12 @@
 """Tests for the users API endpoints."""
 
-from typing import TYPE_CHECKING, Dict, Any
-import json
-from datetime import datetime, timedelta
-from unittest.mock import patch
+from typing import TYPE_CHECKING
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
-from src.mental_health_coach.auth.security import get_password_hash
 from src.mental_health_coach.models.user import User, UserProfile, SessionSchedule
-from src.mental_health_coach.auth.security import create_access_token
-from src.mental_health_coach.app import app
 
 if TYPE_CHECKING:
     from _pytest.capture import CaptureFixture
@@ -22,51 +16,6 @@ if TYPE_CHECKING:
     from pytest_mock.plugin import MockerFixture
 
 
-@pytest.fixture
-def client() -> TestClient:
-    """Create a test client for the API.
-    
-    Returns:
-        TestClient: The test client.
-    """
-    return TestClient(app)
-
-
-@pytest.fixture
-def user(db: Session) -> User:
-    """Create a test user.
-    
-    Args:
-        db: The database session.
-        
-    Returns:
-        User: The test user.
-    """
-    user = User(
-        email="test@example.com",
-        hashed_password="hashed_password",
-        first_name="Test",
-        last_name="User",
-    )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
-
-
-@pytest.fixture
-def user_token(user: User) -> str:
-    """Create a token for the test user.
-    
-    Args:
-        user: The test user.
-        
-    Returns:
-        str: The access token.
-    """
-    return create_access_token(data={"sub": user.email})
-
-
 def test_create_user(client: TestClient, db: Session) -> None:
     """Test creating a new user.
     
@@ -91,7 +40,7 @@ def test_create_user(client: TestClient, db: Session) -> None:
     assert "id" in data
     
     # Verify user was created in the database
-    user = db.query(User).filter(User.email == "new@example.com").first()
+    user = db.get(User, data["id"])
     assert user is not None
     assert user.first_name == "New"
     assert user.last_name == "User"
@@ -122,17 +71,15 @@ def test_create_user_existing_email(client: TestClient, user: User) -> None:
     assert "Email already registered" in data["detail"]
 
 
-def test_read_current_user(client: TestClient, user: User, user_token: str) -> None:
+def test_read_current_user(auth_client: TestClient, user: User) -> None:
     """Test reading the current user.
     
     Args:
-        client: The test client.
+        auth_client: The authenticated test client.
         user: The test user.
-        user_token: The access token for the test user.
     """
-    response = client.get(
+    response = auth_client.get(
         "/api/users/me",
-        headers={"Authorization": f"Bearer {user_token}"},
     )
     assert response.status_code == 200
     data = response.json()
@@ -157,18 +104,16 @@ def test_read_current_user_no_token(client: TestClient) -> None:
     assert "detail" in data
 
 
-def test_create_user_profile(client: TestClient, user: User, user_token: str, db: Session) -> None:
+def test_create_user_profile(auth_client: TestClient, user: User, db: Session) -> None:
     """Test creating a user profile.
     
     Args:
-        client: The test client.
+        auth_client: The authenticated test client.
         user: The test user.
-        user_token: The access token for the test user.
         db: The database session.
     """
-    response = client.post(
+    response = auth_client.post(
         "/api/users/me/profile",
-        headers={"Authorization": f"Bearer {user_token}"},
         json={
             "age": 30,
             "location": "New York",
@@ -188,7 +133,7 @@ def test_create_user_profile(client: TestClient, user: User, user_token: str, db
     assert data["session_frequency"] == 3
     
     # Verify profile was created in the database
-    profile = db.query(UserProfile).filter(UserProfile.user_id == user.id).first()
+    profile = db.get(UserProfile, data["id"])
     assert profile is not None
     assert profile.age == 30
     assert profile.location == "New York"
@@ -198,13 +143,12 @@ def test_create_user_profile(client: TestClient, user: User, user_token: str, db
     assert profile.session_frequency == 3
 
 
-def test_update_user_profile(client: TestClient, user: User, user_token: str, db: Session) -> None:
+def test_update_user_profile(auth_client: TestClient, user: User, db: Session) -> None:
     """Test updating a user profile.
     
     Args:
-        client: The test client.
+        auth_client: The authenticated test client.
         user: The test user.
-        user_token: The access token for the test user.
         db: The database session.
     """
     # Create a profile first
@@ -221,9 +165,8 @@ def test_update_user_profile(client: TestClient, user: User, user_token: str, db
     db.commit()
     
     # Update the profile
-    response = client.put(
+    response = auth_client.put(
         "/api/users/me/profile",
-        headers={"Authorization": f"Bearer {user_token}"},
         json={
             "age": 26,
             "location": "New York",
@@ -243,7 +186,14 @@ def test_update_user_profile(client: TestClient, user: User, user_token: str, db
     assert data["session_frequency"] == 3
     
     # Verify profile was updated in the database
-    db.refresh(profile)
+    db.refresh(profile, attribute_names=[
+        "age",
+        "location",
+        "anxiety_score",
+        "depression_score",
+        "communication_preference",
+        "session_frequency",
+    ])
     assert profile.age == 26
     assert profile.location == "New York"
     assert profile.anxiety_score == 3
@@ -252,18 +202,17 @@ def test_update_user_profile(client: TestClient, user: User, user_token: str, db
     assert profile.session_frequency == 3
 
 
-def test_create_session_schedule(client: TestClient, user: User, user_token: str, db: Session) -> None:
-    """Test creating a session schedule.
+def test_session_schedule_lifecycle(auth_client: TestClient, user: User, db: Session) -> None:
+    """Test creating, reading, updating and deleting session schedules.
     
     Args:
-        client: The test client.
+        auth_client: The authenticated test client.
         user: The test user.
-        user_token: The access token for the test user.
         db: The database session.
     """
-    response = client.post(
+    # Create a schedule
+    response = auth_client.post(
         "/api/users/me/schedule",
-        headers={"Authorization": f"Bearer {user_token}"},
         json={
             "day_of_week": 1,  # Tuesday
             "hour": 14,  # 2 PM
@@ -279,46 +228,27 @@ def test_create_session_schedule(client: TestClient, user: User, user_token: str
     assert "id" in data
     
     # Verify schedule was created in the database
-    schedule = db.query(SessionSchedule).filter(SessionSchedule.user_id == user.id).first()
+    schedule = db.get(SessionSchedule, data["id"])
     assert schedule is not None
+    assert schedule.user_id == user.id
     assert schedule.day_of_week == 1
     assert schedule.hour == 14
     assert schedule.minute == 30
     assert schedule.is_active is True
-
-
-def test_read_session_schedules(client: TestClient, user: User, user_token: str, db: Session) -> None:
-    """Test reading session schedules.
     
-    Args:
-        client: The test client.
-        user: The test user.
-        user_token: The access token for the test user.
-        db: The database session.
-    """
-    # Create two schedules
-    schedule1 = SessionSchedule(
-        user_id=user.id,
-        day_of_week=1,  # Tuesday
-        hour=14,
-        minute=30,
-        is_active=True,
-    )
-    schedule2 = SessionSchedule(
-        user_id=user.id,
-        day_of_week=4,  # Friday
-        hour=10,
-        minute=0,
-        is_active=True,
-    )
-    db.add(schedule1)
-    db.add(schedule2)
-    db.commit()
-    
-    response = client.get(
+    # Create a second schedule
+    response = auth_client.post(
         "/api/users/me/schedule",
-        headers={"Authorization": f"Bearer {user_token}"},
+        json={
+            "day_of_week": 4,  # Friday
+            "hour": 10,
+            "minute": 0,
+        },
     )
+    assert response.status_code == 201
+    
+    # Read the schedules back
+    response = auth_client.get("/api/users/me/schedule")
     assert response.status_code == 200
     data = response.json()
     assert len(data) == 2
@@ -331,33 +261,10 @@ def test_read_session_schedules(client: TestClient, user: User, user_token: str,
     assert data[1]["day_of_week"] == 4
     assert data[1]["hour"] == 10
     assert data[1]["minute"] == 0
-
-
-def test_update_session_schedule(client: TestClient, user: User, user_token: str, db: Session) -> None:
-    """Test updating a session schedule.
     
-    Args:
-        client: The test client.
-        user: The test user.
-        user_token: The access token for the test user.
-        db: The database session.
-    """
-    # Create a schedule
-    schedule = SessionSchedule(
-        user_id=user.id,
-        day_of_week=1,  # Tuesday
-        hour=14,
-        minute=30,
-        is_active=True,
-    )
-    db.add(schedule)
-    db.commit()
-    db.refresh(schedule)
-    
-    # Update the schedule
-    response = client.put(
+    # Update the first schedule
+    response = auth_client.put(
         f"/api/users/me/schedule/{schedule.id}",
-        headers={"Authorization": f"Bearer {user_token}"},
         json={
             "day_of_week": 2,  # Wednesday
             "hour": 15,
@@ -371,40 +278,17 @@ def test_update_session_schedule(client: TestClient, user: User, user_token: str
     assert data["minute"] == 0
     
     # Verify schedule was updated in the database
-    db.refresh(schedule)
+    db.refresh(schedule, attribute_names=["day_of_week", "hour", "minute"])
     assert schedule.day_of_week == 2
     assert schedule.hour == 15
     assert schedule.minute == 0
-
-
-def test_delete_session_schedule(client: TestClient, user: User, user_token: str, db: Session) -> None:
-    """Test deleting a session schedule.
-    
-    Args:
-        client: The test client.
-        user: The test user.
-        user_token: The access token for the test user.
-        db: The database session.
-    """
-    # Create a schedule
-    schedule = SessionSchedule(
-        user_id=user.id,
-        day_of_week=1,  # Tuesday
-        hour=14,
-        minute=30,
-        is_active=True,
-    )
-    db.add(schedule)
-    db.commit()
-    db.refresh(schedule)
     
     # Delete the schedule
-    response = client.delete(
+    response = auth_client.delete(
         f"/api/users/me/schedule/{schedule.id}",
-        headers={"Authorization": f"Bearer {user_token}"},
     )
     assert response.status_code == 204
     
     # Verify schedule was marked as inactive (soft delete)
-    db.refresh(schedule)
-    assert schedule.is_active is False 
\ No newline at end of file
+    db.refresh(schedule, attribute_names=["is_active"])
+    assert schedule.is_active is False
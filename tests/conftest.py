@@ -4,9 +4,27 @@ This module provides fixtures for testing the mental health coach application.
 """
 
 import os
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, Iterator, List
+
+# Point the application at an in-memory database before it is imported, so
+# the app's own engine (used during startup) never touches a file on disk
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from src.mental_health_coach.auth import security
+from src.mental_health_coach.auth.security import create_access_token, get_password_hash
+from src.mental_health_coach.database import get_db
 
 # Import the Base from models.base to ensure consistency
 from src.mental_health_coach.models.base import Base
@@ -18,6 +36,29 @@ from src.mental_health_coach.models.assessment import Assessment, SessionMoodRat
 from src.mental_health_coach.models.emergency_contact import EmergencyContact
 
 
+def _schema_ddl(dialect) -> str:
+    """Compile the DDL for every table and index in the metadata.
+    
+    Args:
+        dialect: SQL dialect to compile the statements for.
+        
+    Returns:
+        str: Script creating the whole schema, in dependency order.
+    """
+    statements = []
+    for table in Base.metadata.sorted_tables:
+        statements.append(str(CreateTable(table).compile(dialect=dialect)).strip())
+        statements.extend(
+            str(CreateIndex(index).compile(dialect=dialect)).strip()
+            for index in table.indexes
+        )
+    return ";\n".join(statements) + ";"
+
+
+# The schema script, compiled once per test process
+_SCHEMA_DDL = _schema_ddl(sqlite.dialect())
+
+
 @pytest.fixture(scope="session")
 def test_db_engine():
     """Create a test database engine.
@@ -25,44 +66,377 @@ def test_db_engine():
     Returns:
         SQLAlchemy engine for the test database.
     """
-    # Use file-based SQLite for tests
-    test_db_path = "test_mental_health_coach.db"
-    
-    # Remove existing test DB if it exists
-    if os.path.exists(test_db_path):
-        os.remove(test_db_path)
-    
+    # Keep the whole test database in memory; StaticPool hands out the one
+    # connection that holds it, so every session sees the same tables. An
+    # in-memory database is private to its process, so each pytest-xdist
+    # worker gets its own without keying anything on PYTEST_XDIST_WORKER
     engine = create_engine(
-        f"sqlite:///{test_db_path}",
+        "sqlite://",
         connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        # Tests roll back their own transactions, and the connection can't
+        # go stale; don't ping or reset it on every checkout and return
+        pool_pre_ping=False,
+        pool_reset_on_return=None,
     )
     
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
+    # pysqlite defers BEGIN until the first DML statement, which breaks
+    # SAVEPOINT-based test isolation; let SQLAlchemy emit BEGIN itself
+    @event.listens_for(engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        """Turn off the driver's own transaction handling."""
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        """Skip durability work the throwaway test database doesn't need."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA locking_mode=EXCLUSIVE")
+        cursor.close()
+    
+    @event.listens_for(engine, "begin")
+    def emit_begin(conn):
+        """Start the transaction explicitly."""
+        conn.exec_driver_sql("BEGIN")
+    
+    # Replay the precompiled schema on the fresh database; unlike
+    # create_all, this skips checking for each table before creating it
+    raw_connection = engine.raw_connection()
+    try:
+        raw_connection.driver_connection.executescript(_SCHEMA_DDL)
+    finally:
+        raw_connection.close()
     
     yield engine
     
-    # Clean up after tests
-    if os.path.exists(test_db_path):
-        os.remove(test_db_path)
+    engine.dispose()
 
 
-@pytest.fixture
-def db_session(test_db_engine):
-    """Create a test database session.
+@pytest.fixture(scope="session")
+def test_db_connection(test_db_engine):
+    """Open the one connection every test session runs on.
+    
+    Tests isolate themselves with transactions on this connection instead
+    of checking a connection out of the pool each time.
     
     Args:
         test_db_engine: Test database engine.
         
     Returns:
-        Database session for testing.
+        Connection to the test database.
+    """
+    with test_db_engine.connect() as connection:
+        yield connection
+
+
+# The bcrypt context the application is configured with, before any swap
+_REAL_PWD_CONTEXT = security.pwd_context
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing():
+    """Replace bcrypt with a no-op password scheme for the test session.
+    
+    bcrypt is deliberately slow and the tests only need hashes that verify.
+    Set TEST_FAST_HASH=0 to run the whole session with real hashing.
+    """
+    if os.getenv("TEST_FAST_HASH", "1") == "0":
+        yield
+        return
+    
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(security, "pwd_context", CryptContext(schemes=["plaintext"]))
+        yield
+
+
+@pytest.fixture
+def real_password_hashing(monkeypatch):
+    """Restore the application's bcrypt context for a single test.
+    
+    Args:
+        monkeypatch: Pytest monkeypatch fixture.
+    """
+    monkeypatch.setattr(security, "pwd_context", _REAL_PWD_CONTEXT)
+
+
+@pytest.fixture(scope="session")
+def hashed_test_password(fast_password_hashing) -> str:
+    """Hash the shared test password once for the whole session.
+    
+    Args:
+        fast_password_hashing: Ensures the session's hashing scheme is set.
+        
+    Returns:
+        str: Hash of "password123".
+    """
+    return get_password_hash("password123")
+
+
+@pytest.fixture(scope="session")
+def access_token_for() -> Callable[[str], str]:
+    """Provide access tokens cached per email for the whole session.
+    
+    Tokens stay valid for ACCESS_TOKEN_EXPIRE_MINUTES, well beyond a test
+    run, so each email is signed once. Tests that need a fresh or expired
+    token should call create_access_token directly.
+    
+    Returns:
+        Callable[[str], str]: Function mapping an email to its token.
+    """
+    @lru_cache(maxsize=None)
+    def token_for(email: str) -> str:
+        return create_access_token(data={"sub": email})
+    
+    return token_for
+
+
+# Sessions opened by the db fixtures, innermost last; endpoints use the
+# innermost one through the get_db override
+_active_sessions: List[Session] = []
+
+
+def _override_get_db() -> Iterator[Session]:
+    """Yield the current test's session to endpoints.
+    
+    Falls back to the application's own session when no db fixture is
+    active for the test.
+    
+    Yields:
+        The database session for the request.
+    """
+    if _active_sessions:
+        yield _active_sessions[-1]
+    else:
+        yield from get_db()
+
+
+@contextmanager
+def _rollback_session(
+    connection: Connection, expire_on_commit: bool = True
+) -> Iterator[Session]:
+    """Open a session whose changes are rolled back when the block exits.
+    
+    The session runs inside an outer transaction and turns its own commits
+    into SAVEPOINTs, so callers can commit freely without dropping or
+    recreating tables. If the connection is already in a transaction, the
+    outer transaction is a SAVEPOINT nested inside it.
+    
+    Args:
+        connection: Connection to run the session on.
+        expire_on_commit: Whether commits expire the session's objects.
+        
+    Yields:
+        The rollback-isolated session.
     """
-    # Create session
-    TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_db_engine)
-    session = TestSessionLocal()
+    if connection.in_transaction():
+        transaction = connection.begin_nested()
+    else:
+        transaction = connection.begin()
+    session = Session(
+        bind=connection,
+        autoflush=False,
+        expire_on_commit=expire_on_commit,
+        join_transaction_mode="create_savepoint",
+    )
     
     try:
         yield session
     finally:
-        session.rollback()
-        session.close() 
\ No newline at end of file
+        session.close()
+        transaction.rollback()
+
+
+@pytest.fixture
+def db(test_db_connection):
+    """Create a database session whose changes are rolled back after the test.
+    
+    Endpoints called through the client see the same session via the
+    get_db override, so they read the test's uncommitted rows.
+    
+    Args:
+        test_db_connection: Session-wide test database connection.
+        
+    Returns:
+        Database session for testing.
+    """
+    with _rollback_session(test_db_connection) as session:
+        _active_sessions.append(session)
+        try:
+            yield session
+        finally:
+            _active_sessions.pop()
+
+
+@pytest.fixture(scope="module")
+def module_db(test_db_connection):
+    """Create a database session for data seeded once per module.
+    
+    Module-scoped fixtures insert their rows through this session; the rows
+    are rolled back when the module finishes. Its objects are not expired
+    on commit, so tests can read them without going back to the database.
+    Tests themselves should write through nested_db.
+    
+    Args:
+        test_db_connection: Session-wide test database connection.
+        
+    Returns:
+        Database session for the module.
+    """
+    with _rollback_session(test_db_connection, expire_on_commit=False) as session:
+        yield session
+
+
+@pytest.fixture
+def nested_db(module_db):
+    """Create a per-test session on top of the module's seeded data.
+    
+    The session runs in a SAVEPOINT on the module's connection, so it sees
+    the seed rows while the test's own changes are rolled back afterwards.
+    Endpoints use it through the get_db override.
+    
+    Args:
+        module_db: Module-scoped database session.
+        
+    Returns:
+        Database session for testing.
+    """
+    with _rollback_session(module_db.get_bind()) as session:
+        _active_sessions.append(session)
+        try:
+            yield session
+        finally:
+            _active_sessions.pop()
+
+
+@pytest.fixture(scope="session")
+def user_factory() -> Callable[..., User]:
+    """Provide a function that adds a test user to a session.
+    
+    The user is flushed rather than committed: the primary key is assigned
+    and the row is visible to the session, and the enclosing test
+    transaction rolls it back.
+    
+    Returns:
+        Callable[..., User]: Function taking a session and field overrides.
+    """
+    def make_user(session: Session, **overrides) -> User:
+        user = User(**{
+            "email": "test@example.com",
+            "hashed_password": "hashed_password",
+            "first_name": "Test",
+            "last_name": "User",
+            **overrides,
+        })
+        session.add(user)
+        session.flush()
+        return user
+    
+    return make_user
+
+
+@pytest.fixture(scope="session")
+def conversation_factory() -> Callable[..., Conversation]:
+    """Provide a function that adds a test conversation to a session.
+    
+    Returns:
+        Callable[..., Conversation]: Function taking a session, the owning
+            user and field overrides.
+    """
+    def make_conversation(session: Session, user: User, **overrides) -> Conversation:
+        conversation = Conversation(**{
+            "user_id": user.id,
+            "title": "Test Conversation",
+            "is_formal_session": True,
+            "session_number": 1,
+            **overrides,
+        })
+        session.add(conversation)
+        session.flush()
+        return conversation
+    
+    return make_conversation
+
+
+@pytest.fixture
+def user(db: Session, user_factory: Callable[..., User]) -> User:
+    """Create a test user.
+    
+    Args:
+        db: Database session.
+        user_factory: Session-wide user factory.
+        
+    Returns:
+        User: Test user.
+    """
+    return user_factory(db)
+
+
+@pytest.fixture
+def conversation(
+    db: Session, user: User, conversation_factory: Callable[..., Conversation]
+) -> Conversation:
+    """Create a test conversation.
+    
+    Args:
+        db: Database session.
+        user: Test user.
+        conversation_factory: Session-wide conversation factory.
+        
+    Returns:
+        Conversation: Test conversation.
+    """
+    return conversation_factory(db, user)
+
+
+@pytest.fixture(scope="session")
+def _session_client(test_db_engine):
+    """Create a test client shared by the whole test session.
+    
+    App startup runs once instead of once per test; per-test database
+    isolation comes from the db fixture's get_db override. The application
+    is imported here so tests that never call an endpoint don't load it.
+    
+    Args:
+        test_db_engine: Test database engine.
+        
+    Returns:
+        TestClient: The test client.
+    """
+    from src.mental_health_coach.app import app
+    
+    app.dependency_overrides[get_db] = _override_get_db
+    try:
+        # Entering the client runs the app's lifespan, which creates the
+        # tables that _override_get_db's fallback session relies on
+        with TestClient(app) as test_client:
+            yield test_client
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+def client(_session_client):
+    """Lend the shared test client to one test.
+    
+    Dependency overrides the test adds or replaces are undone afterwards,
+    and cookies it picked up are dropped, so nothing leaks into the next
+    test through the long-lived client.
+    
+    Args:
+        _session_client: Session-wide test client.
+        
+    Returns:
+        TestClient: The test client.
+    """
+    overrides = _session_client.app.dependency_overrides
+    saved = dict(overrides)
+    try:
+        yield _session_client
+    finally:
+        for dependency in set(overrides) - set(saved):
+            overrides.pop(dependency)
+        overrides.update(saved)
+        _session_client.cookies.clear()
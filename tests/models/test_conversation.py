@@ -1,44 +1,12 @@
 """Tests for the conversation models."""
 
-from typing import TYPE_CHECKING
 from datetime import datetime
 
-import pytest
 from sqlalchemy.orm import Session
 
 from src.mental_health_coach.models.user import User
 from src.mental_health_coach.models.conversation import Conversation, Message, ImportantMemory
 
-if TYPE_CHECKING:
-    from _pytest.capture import CaptureFixture
-    from _pytest.fixtures import FixtureRequest
-    from _pytest.logging import LogCaptureFixture
-    from _pytest.monkeypatch import MonkeyPatch
-    from pytest_mock.plugin import MockerFixture
-
-
-@pytest.fixture
-def user(db: Session) -> User:
-    """Create a test user.
-    
-    Args:
-        db: Database session.
-        
-    Returns:
-        User: Test user.
-    """
-    user_data = {
-        "email": "test@example.com",
-        "hashed_password": "hashed_password",
-        "first_name": "Test",
-        "last_name": "User",
-    }
-    user = User(**user_data)
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
-
 
 def test_create_conversation(db: Session, user: User) -> None:
     """Test creating a conversation.
@@ -56,8 +24,7 @@ def test_create_conversation(db: Session, user: User) -> None:
     }
     conversation = Conversation(**conversation_data)
     db.add(conversation)
-    db.commit()
-    db.refresh(conversation)
+    db.flush()
     
     # Check the conversation was created with the correct data
     assert conversation.id is not None
@@ -82,8 +49,7 @@ def test_create_message(db: Session, user: User) -> None:
     # Create a conversation
     conversation = Conversation(user_id=user.id, title="Test Conversation")
     db.add(conversation)
-    db.commit()
-    db.refresh(conversation)
+    db.flush()
     
     # Create a message
     message_data = {
@@ -93,8 +59,7 @@ def test_create_message(db: Session, user: User) -> None:
     }
     message = Message(**message_data)
     db.add(message)
-    db.commit()
-    db.refresh(message)
+    db.flush()
     
     # Check the message was created with the correct data
     assert message.id is not None
@@ -117,32 +82,22 @@ def test_create_important_memory(db: Session, user: User) -> None:
         db: Database session.
         user: Test user.
     """
-    # Create a conversation and message
-    conversation = Conversation(user_id=user.id, title="Test Conversation")
-    db.add(conversation)
-    db.commit()
-    
+    # Build the conversation, message and memory, linked through their
+    # relationships, and insert them in one flush
+    conversation = Conversation(user=user, title="Test Conversation")
     message = Message(
-        conversation_id=conversation.id,
+        conversation=conversation,
         is_from_user=True,
         content="I get anxious when speaking in public.",
     )
-    db.add(message)
-    db.commit()
-    db.refresh(message)
-    
-    # Create an important memory
     memory_data = {
-        "user_id": user.id,
         "content": "User experiences anxiety with public speaking.",
         "category": "triggers",
         "importance_score": 80,
-        "source_message_id": message.id,
     }
-    memory = ImportantMemory(**memory_data)
-    db.add(memory)
-    db.commit()
-    db.refresh(memory)
+    memory = ImportantMemory(user=user, conversation=conversation, **memory_data)
+    db.add_all([conversation, message, memory])
+    db.flush()
     
     # Check the memory was created with the correct data
     assert memory.id is not None
@@ -150,11 +105,12 @@ def test_create_important_memory(db: Session, user: User) -> None:
     assert memory.content == memory_data["content"]
     assert memory.category == memory_data["category"]
     assert memory.importance_score == memory_data["importance_score"]
-    assert memory.source_message_id == message.id
+    assert memory.conversation_id == conversation.id
     assert isinstance(memory.created_at, datetime)
     assert isinstance(memory.updated_at, datetime)
     
     # Check the relationships
     assert memory.user == user
-    assert memory.source_message == message
+    assert memory.conversation == conversation
+    assert message in conversation.messages
     assert memory in user.important_memories 
\ No newline at end of file
@@ -1,67 +1,17 @@
 """Tests for the homework models."""
 
-from typing import TYPE_CHECKING
 from datetime import datetime, timedelta
 
-import pytest
 from sqlalchemy.orm import Session
 
 from src.mental_health_coach.models.user import User
 from src.mental_health_coach.models.conversation import Conversation
 from src.mental_health_coach.models.homework import HomeworkAssignment, HomeworkProgressNote
 
-if TYPE_CHECKING:
-    from _pytest.capture import CaptureFixture
-    from _pytest.fixtures import FixtureRequest
-    from _pytest.logging import LogCaptureFixture
-    from _pytest.monkeypatch import MonkeyPatch
-    from pytest_mock.plugin import MockerFixture
 
-
-@pytest.fixture
-def user(db: Session) -> User:
-    """Create a test user.
-    
-    Args:
-        db: Database session.
-        
-    Returns:
-        User: Test user.
-    """
-    user_data = {
-        "email": "test@example.com",
-        "hashed_password": "hashed_password",
-        "first_name": "Test",
-        "last_name": "User",
-    }
-    user = User(**user_data)
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
-
-
-@pytest.fixture
-def conversation(db: Session, user: User) -> Conversation:
-    """Create a test conversation.
-    
-    Args:
-        db: Database session.
-        user: Test user.
-        
-    Returns:
-        Conversation: Test conversation.
-    """
-    conversation = Conversation(
-        user_id=user.id,
-        title="Test Conversation",
-        is_formal_session=True,
-        session_number=1,
-    )
-    db.add(conversation)
-    db.commit()
-    db.refresh(conversation)
-    return conversation
+# Fixed timestamps keep the tests deterministic
+_FIXED_NOW = datetime(2024, 1, 1)
+_DUE = _FIXED_NOW + timedelta(days=7)
 
 
 def test_create_homework_assignment(db: Session, user: User, conversation: Conversation) -> None:
@@ -73,7 +23,7 @@ def test_create_homework_assignment(db: Session, user: User, conversation: Conve
         conversation: Test conversation.
     """
     # Create a homework assignment
-    due_date = datetime.utcnow() + timedelta(days=7)
+    due_date = _DUE
     homework_data = {
         "user_id": user.id,
         "conversation_id": conversation.id,
@@ -84,8 +34,7 @@ def test_create_homework_assignment(db: Session, user: User, conversation: Conve
     }
     homework = HomeworkAssignment(**homework_data)
     db.add(homework)
-    db.commit()
-    db.refresh(homework)
+    db.flush()
     
     # Check the homework was created with the correct data
     assert homework.id is not None
@@ -118,29 +67,23 @@ def test_create_homework_progress_note(
         user: Test user.
         conversation: Test conversation.
     """
-    # Create a homework assignment
-    due_date = datetime.utcnow() + timedelta(days=7)
+    # Build the homework assignment and a progress note on it, linked
+    # through the relationship, and insert them in one flush
+    due_date = _DUE
     homework = HomeworkAssignment(
-        user_id=user.id,
-        conversation_id=conversation.id,
+        user=user,
+        conversation=conversation,
         title="Breathing Exercises",
         description="Practice deep breathing for 5 minutes twice daily.",
         technique="cbt",
         due_date=due_date,
     )
-    db.add(homework)
-    db.commit()
-    db.refresh(homework)
-    
-    # Create a progress note
     note_data = {
-        "homework_assignment_id": homework.id,
         "content": "I practiced for 5 minutes this morning and felt calmer afterward.",
     }
-    note = HomeworkProgressNote(**note_data)
-    db.add(note)
-    db.commit()
-    db.refresh(note)
+    note = HomeworkProgressNote(homework_assignment=homework, **note_data)
+    db.add_all([homework, note])
+    db.flush()
     
     # Check the note was created with the correct data
     assert note.id is not None
@@ -164,7 +107,7 @@ def test_complete_homework_assignment(
         conversation: Test conversation.
     """
     # Create a homework assignment
-    due_date = datetime.utcnow() + timedelta(days=7)
+    due_date = _DUE
     homework = HomeworkAssignment(
         user_id=user.id,
         conversation_id=conversation.id,
@@ -174,18 +117,17 @@ def test_complete_homework_assignment(
         due_date=due_date,
     )
     db.add(homework)
-    db.commit()
-    db.refresh(homework)
+    db.flush()
     
     # Complete the homework
     completion_notes = "I found this exercise very helpful for reducing anxiety."
     homework.is_completed = True
     homework.completion_notes = completion_notes
-    homework.completion_date = datetime.utcnow()
-    db.commit()
-    db.refresh(homework)
+    homework.completion_date = _FIXED_NOW
+    db.flush()
+    db.refresh(homework, attribute_names=["is_completed", "completion_notes", "completion_date"])
     
     # Check the homework was updated correctly
     assert homework.is_completed is True
     assert homework.completion_notes == completion_notes
-    assert isinstance(homework.completion_date, datetime) 
\ No newline at end of file
+    assert homework.completion_date == _FIXED_NOW
\ No newline at end of file
@@ -1,6 +1,5 @@
 """Tests for the user models."""
 
-from typing import TYPE_CHECKING
 from datetime import datetime
 
 import pytest
@@ -8,13 +7,6 @@ from sqlalchemy.orm import Session
 
 from src.mental_health_coach.models.user import User, UserProfile, SessionSchedule
 
-if TYPE_CHECKING:
-    from _pytest.capture import CaptureFixture
-    from _pytest.fixtures import FixtureRequest
-    from _pytest.logging import LogCaptureFixture
-    from _pytest.monkeypatch import MonkeyPatch
-    from pytest_mock.plugin import MockerFixture
-
 
 @pytest.fixture
 def user_data() -> dict:
@@ -41,8 +33,7 @@ def test_create_user(db: Session, user_data: dict) -> None:
     # Create a user
     user = User(**user_data)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    db.flush()
     
     # Check the user was created with the correct data
     assert user.id is not None
@@ -65,8 +56,7 @@ def test_create_user_profile(db: Session, user_data: dict) -> None:
     # Create a user
     user = User(**user_data)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    db.flush()
     
     # Create a profile for the user
     profile_data = {
@@ -80,8 +70,7 @@ def test_create_user_profile(db: Session, user_data: dict) -> None:
     }
     profile = UserProfile(**profile_data)
     db.add(profile)
-    db.commit()
-    db.refresh(profile)
+    db.flush()
     
     # Check the profile was created with the correct data
     assert profile.id is not None
@@ -109,8 +98,7 @@ def test_create_session_schedule(db: Session, user_data: dict) -> None:
     # Create a user
     user = User(**user_data)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    db.flush()
     
     # Create a session schedule for the user
     schedule_data = {
@@ -121,8 +109,7 @@ def test_create_session_schedule(db: Session, user_data: dict) -> None:
     }
     schedule = SessionSchedule(**schedule_data)
     db.add(schedule)
-    db.commit()
-    db.refresh(schedule)
+    db.flush()
     
     # Check the schedule was created with the correct data
     assert schedule.id is not None
@@ -22,11 +22,12 @@ class MockAssessment:
 class TestAssessmentService:
     """Tests for the AssessmentService class."""
     
-    def setup_method(self):
-        """Setup test environment."""
+    @classmethod
+    def setup_class(cls):
+        """Setup test environment once for the class."""
         # Import here to apply patch
         from src.mental_health_coach.services.assessment_service import AssessmentService
-        self.AssessmentService = AssessmentService
+        cls.AssessmentService = AssessmentService
     
     def test_create_assessment(self):
         """Test creating an assessment."""
@@ -82,13 +83,8 @@ class TestAssessmentService:
         service = self.AssessmentService(mock_db)
         
         # Set up mock return values for GAD-7 and PHQ-9
-        gad7_mock = Mock()
-        gad7_mock.score = 15.0
-        gad7_mock.taken_at = datetime.utcnow()
-        
-        phq9_mock = Mock()
-        phq9_mock.score = 12.0
-        phq9_mock.taken_at = datetime.utcnow()
+        gad7_mock = MockAssessment(score=15.0, taken_at=datetime.utcnow())
+        phq9_mock = MockAssessment(score=12.0, taken_at=datetime.utcnow())
         
         # Configure the mock to return different values for different calls
         mock_get_latest.side_effect = lambda user_id, assessment_type: {
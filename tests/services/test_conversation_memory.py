@@ -136,20 +136,25 @@ def memories(user, conversations):
 def test_index_conversations():
     """Test indexing conversations for semantic search."""
     # Import the class to patch
+    from scipy import sparse
+    
     from src.mental_health_coach.services.rag.conversation_memory import ConversationMemoryService
+    from src.mental_health_coach.services.rag._cache import ChunkEmbeddingCache
     from src.mental_health_coach.models.conversation import Conversation, Message
     
     # Setup
     mock_db = Mock()
     mock_user = MockUser(id=1)
     
-    # Mock queries
+    # Mock the joined conversation/message query
     mock_query = Mock()
+    mock_join = Mock()
     mock_filter = Mock()
     mock_order_by = Mock()
     
     mock_db.query.return_value = mock_query
-    mock_query.filter.return_value = mock_filter
+    mock_query.join.return_value = mock_join
+    mock_join.filter.return_value = mock_filter
     mock_filter.order_by.return_value = mock_order_by
     
     # Create mock conversations
@@ -175,16 +180,6 @@ def test_index_conversations():
             summary="This was about depression",
         ),
     ]
-    mock_order_by.all.return_value = mock_conversations
-    
-    # Mock message queries
-    mock_message_query = Mock()
-    mock_message_filter = Mock()
-    mock_message_order_by = Mock()
-    
-    mock_db.query.side_effect = [mock_query, mock_message_query, mock_message_query]
-    mock_message_query.filter.return_value = mock_message_filter
-    mock_message_filter.order_by.return_value = mock_message_order_by
     
     # Create mock messages for each conversation
     mock_messages_1 = [
@@ -221,16 +216,25 @@ def test_index_conversations():
         )
     ]
     
-    mock_message_order_by.all.side_effect = [mock_messages_1, mock_messages_2]
+    mock_order_by.yield_per.return_value = iter([
+        (mock_conversations[0], message) for message in mock_messages_1
+    ] + [
+        (mock_conversations[1], message) for message in mock_messages_2
+    ])
     
-    # Create service with mock DB
-    service = ConversationMemoryService(db=mock_db, user=mock_user)
+    # Create service with mock DB and its own chunk cache
+    cache = ChunkEmbeddingCache()
+    service = ConversationMemoryService(db=mock_db, user=mock_user, cache=cache)
     
-    # Mock vectorizer
+    # Mock vectorizer and TF-IDF weighting
     service.vectorizer = Mock()
+    service.vectorizer.transform.side_effect = lambda texts: sparse.csr_matrix(
+        np.ones((len(texts), 3))
+    )
+    service.transformer = Mock()
     mock_matrix = Mock()
     mock_matrix.toarray.return_value = np.array([[0.1, 0.2, 0.3]])
-    service.vectorizer.fit_transform.return_value = mock_matrix
+    service.transformer.fit_transform.return_value = mock_matrix
     
     # Call method
     chunks, metadata, vectors = service.index_conversations()
@@ -238,7 +242,18 @@ def test_index_conversations():
     # Verify results
     assert len(chunks) > 0
     assert len(metadata) > 0
+    assert mock_db.query.call_count == 1
+    mock_order_by.yield_per.assert_called_once_with(500)
+    assert [meta["conversation_id"] for meta in metadata] == [1, 2]
     assert isinstance(vectors, np.ndarray) or hasattr(vectors, 'toarray')
+    service.vectorizer.transform.assert_called_once_with(chunks)
+    assert service.transformer.fit_transform.call_args[0][0].shape == (len(chunks), 3)
+    
+    # Every chunk is cached, so counting them again tokenizes nothing
+    assert len(cache) == len(chunks)
+    counts = service._chunk_counts(chunks)
+    assert counts.shape == (len(chunks), 3)
+    assert service.vectorizer.transform.call_count == 1
 
 
 def test_store_important_memory():
@@ -334,4 +349,77 @@ def test_get_user_memories():
     # Verify that memories were retrieved
     assert len(memories) == 2
     assert memories[0].content == "User mentioned having anxiety in social settings"
-    assert memories[1].content == "User feels depressed when alone for long periods" 
\ No newline at end of file
+    assert memories[1].content == "User feels depressed when alone for long periods" 
+
+
+def test_top_k_indices():
+    """Test selecting the highest scores in descending order."""
+    from src.mental_health_coach.services.rag.conversation_memory import _top_k_indices
+    
+    scores = np.array([0.2, 0.9, 0.5, 0.1, 0.7])
+    
+    assert _top_k_indices(scores, 2).tolist() == [1, 4]
+    assert _top_k_indices(scores, 10).tolist() == [1, 4, 2, 0, 3]
+    assert _top_k_indices(scores, 0).tolist() == []
+
+
+def test_retrieve_relevant_context_batch():
+    """Test scoring several queries against one index of the conversations."""
+    from scipy import sparse
+    
+    from src.mental_health_coach.services.rag.conversation_memory import ConversationMemoryService
+    
+    service = ConversationMemoryService(db=Mock(), user=MockUser(id=1))
+    
+    # Three chunks with orthogonal unit vectors
+    chunks = [
+        "User: Work deadlines make me anxious\n",
+        "User: I haven't been sleeping well\n",
+        "User: Walking my dog helps me relax\n",
+    ]
+    metadata = [{"conversation_id": conversation_id} for conversation_id in (1, 2, 3)]
+    corpus = sparse.csr_matrix(np.eye(3, dtype=np.float32))
+    service.index_conversations = Mock(return_value=(chunks, metadata, corpus))
+    
+    # Mock vectorizer and TF-IDF weighting for the two queries
+    service.vectorizer = Mock()
+    service.transformer = Mock()
+    service.transformer.transform.return_value = sparse.csr_matrix(
+        np.array([[0.9, 0.3, 0.0], [0.0, 0.0, 1.0]], dtype=np.float32)
+    )
+    
+    results = service.retrieve_relevant_context_batch(
+        ["stress at work", "my pets"], max_results=2
+    )
+    
+    # Conversations are indexed once and both queries vectorized together
+    service.index_conversations.assert_called_once_with()
+    service.vectorizer.transform.assert_called_once_with(["stress at work", "my pets"])
+    
+    assert [r["metadata"]["conversation_id"] for r in results[0]] == [1, 2]
+    assert results[0][0]["similarity_score"] == pytest.approx(0.9)
+    assert [r["metadata"]["conversation_id"] for r in results[1]] == [3]
+
+
+def test_services_share_vectorizer():
+    """Test that services reuse one vectorizer but fit their own weights."""
+    from src.mental_health_coach.services.rag.conversation_memory import ConversationMemoryService
+    
+    first = ConversationMemoryService(db=Mock(), user=MockUser(id=1))
+    second = ConversationMemoryService(db=Mock(), user=MockUser(id=2))
+    
+    assert first.vectorizer is second.vectorizer
+    assert first.transformer is not second.transformer
+
+
+def test_re2_tokenizer_matches_default_pattern():
+    """Test that the re2 tokenizer finds the same tokens as scikit-learn."""
+    import re
+    
+    pytest.importorskip("re2")
+    from src.mental_health_coach.services.rag.conversation_memory import _re2_tokenizer
+    
+    text = "User: I'm anxious about my café shift_2 at 9am, it's a lot!"
+    default_tokens = re.compile(r"(?u)\b\w\w+\b").findall(text)
+    
+    assert _re2_tokenizer()(text) == default_tokens
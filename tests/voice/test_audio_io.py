@@ -3,12 +3,14 @@
 from typing import TYPE_CHECKING
 import os
 import tempfile
+import threading
 import time
 
 import pytest
 
 from src.mental_health_coach.voice.audio_io import (
     AudioIOFactory,
+    AudioPlayer,
     MockAudioRecorder,
     MockAudioPlayer,
 )
@@ -56,6 +58,19 @@ def test_mock_audio_recorder() -> None:
             os.unlink(temp_path)
 
 
+def test_mock_audio_recorder_in_memory_only(tmp_path) -> None:
+    """Test that the mock recorder can save recordings without touching disk."""
+    recorder = MockAudioRecorder({"in_memory_only": True})
+    recorder.start_recording()
+    audio_data = recorder.stop_recording()
+    
+    path = str(tmp_path / "recording.wav")
+    recorder.save_recording(path)
+    
+    assert not os.path.exists(path)
+    assert MockAudioRecorder.get_saved(path) == audio_data
+
+
 def test_mock_audio_player() -> None:
     """Test the mock audio player."""
     # Create a mock player
@@ -104,4 +119,120 @@ def test_audio_io_factory() -> None:
         AudioIOFactory.create_recorder("unsupported", {})
     
     with pytest.raises(ValueError):
-        AudioIOFactory.create_player("unsupported", {}) 
\ No newline at end of file
+        AudioIOFactory.create_player("unsupported", {}) 
+
+def test_mock_audio_player_shares_scheduler_thread() -> None:
+    """Test that concurrent mock playback does not start a thread per call."""
+    baseline = threading.active_count()
+    players = [MockAudioPlayer({}) for _ in range(20)]
+    for player in players:
+        player.play_audio(b"mock audio data")
+    
+    # At most one worker thread serves all pending completions
+    assert threading.active_count() <= baseline + 1
+    
+    time.sleep(0.6)
+    assert not any(player.is_playing() for player in players)
+
+
+def test_audio_io_factory_register() -> None:
+    """Test registering additional audio backends with the factory."""
+    class CustomRecorder(MockAudioRecorder):
+        pass
+    
+    class CustomPlayer(MockAudioPlayer):
+        pass
+    
+    AudioIOFactory.register_recorder("custom", CustomRecorder)
+    AudioIOFactory.register_player("custom", CustomPlayer)
+    
+    assert isinstance(AudioIOFactory.create_recorder("custom", {}), CustomRecorder)
+    assert isinstance(AudioIOFactory.create_player("custom", {}), CustomPlayer)
+
+
+def test_audio_player_default_play_file(tmp_path) -> None:
+    """Test that the base play_file passes the file contents to play_audio."""
+    received = []
+    
+    class RecordingPlayer(MockAudioPlayer):
+        accepts_views = False
+        
+        def play_audio(self, audio_data) -> None:
+            received.append(audio_data)
+    
+    path = tmp_path / "audio.wav"
+    path.write_bytes(b"RIFF mock wav data")
+    
+    # Bypass the mock's logging-only override to exercise the base implementation
+    AudioPlayer.play_file(RecordingPlayer({}), str(path))
+    
+    assert received == [b"RIFF mock wav data"]
+    assert isinstance(received[0], bytes)
+
+
+def test_audio_player_default_play_file_view(tmp_path) -> None:
+    """Test that players accepting views get the mapped file, released afterwards."""
+    received = []
+    views = []
+    
+    class RecordingPlayer(MockAudioPlayer):
+        accepts_views = True
+        
+        def play_audio(self, audio_data) -> None:
+            views.append(audio_data)
+            received.append(bytes(audio_data))
+    
+    path = tmp_path / "audio.wav"
+    path.write_bytes(b"RIFF mock wav data")
+    
+    AudioPlayer.play_file(RecordingPlayer({}), str(path))
+    
+    assert received == [b"RIFF mock wav data"]
+    assert isinstance(views[0], memoryview)
+    with pytest.raises(ValueError):
+        bytes(views[0])
+
+
+def test_audio_player_default_play_file_view_empty(tmp_path) -> None:
+    """Test that an empty file is played as empty bytes, since it cannot be mapped."""
+    received = []
+    
+    class RecordingPlayer(MockAudioPlayer):
+        accepts_views = True
+        
+        def play_audio(self, audio_data) -> None:
+            received.append(audio_data)
+    
+    path = tmp_path / "empty.wav"
+    path.write_bytes(b"")
+    
+    AudioPlayer.play_file(RecordingPlayer({}), str(path))
+    
+    assert received == [b""]
+
+
+def test_mock_audio_recorder_save_to_buffer() -> None:
+    """Test that the last recording can be read back without touching disk."""
+    recorder = MockAudioRecorder({})
+    recorder.start_recording()
+    audio_data = recorder.stop_recording()
+    
+    buffer = recorder.save_to_buffer()
+    assert buffer.tell() == 0
+    assert buffer.read() == audio_data
+
+
+def test_audio_player_default_play_stream() -> None:
+    """Test that the base play_stream plays the chunks joined in order."""
+    received = []
+    
+    class RecordingPlayer(MockAudioPlayer):
+        accepts_views = False
+        
+        def play_audio(self, audio_data) -> None:
+            received.append(audio_data)
+    
+    AudioPlayer.play_stream(RecordingPlayer({}), iter([b"first ", b"second"]))
+    
+    assert received == [b"first second"]
+    assert isinstance(received[0], bytes)
@@ -0,0 +1,69 @@
+"""Tests for the speech engine cache."""
+
+import threading
+
+from src.mental_health_coach.voice._cache import EngineCache
+
+
+class _Engine:
+    """Minimal shareable engine."""
+    
+    shareable = True
+
+
+def test_engine_cache_creates_outside_global_lock() -> None:
+    """Test that a slow engine creation does not block other keys."""
+    cache = EngineCache()
+    started = threading.Event()
+    finish = threading.Event()
+    
+    def slow_create() -> _Engine:
+        started.set()
+        assert finish.wait(timeout=2.0)
+        return _Engine()
+    
+    results = []
+    worker = threading.Thread(target=lambda: results.append(cache.acquire("slow", slow_create)))
+    worker.start()
+    assert started.wait(timeout=2.0)
+    
+    # Another key is served while "slow" is still being created
+    fast, shared = cache.acquire("fast", _Engine)
+    assert shared is True
+    assert cache.release(fast) is True
+    
+    finish.set()
+    worker.join(timeout=2.0)
+    slow, shared = results[0]
+    assert shared is True
+    
+    # Later users of the key get the engine that was created
+    assert cache.acquire("slow", _Engine) == (slow, True)
+    cache.release(slow)
+    cache.release(slow)
+
+
+def test_engine_cache_creates_each_key_once() -> None:
+    """Test that concurrent users of one key share a single creation."""
+    cache = EngineCache()
+    created = []
+    barrier = threading.Barrier(4)
+    results = []
+    
+    def create() -> _Engine:
+        engine = _Engine()
+        created.append(engine)
+        return engine
+    
+    def use() -> None:
+        barrier.wait(timeout=2.0)
+        results.append(cache.acquire("key", create)[0])
+    
+    workers = [threading.Thread(target=use) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=2.0)
+    
+    assert len(created) == 1
+    assert results == created * 4
@@ -1,6 +1,7 @@
 """Tests for the voice conversation manager."""
 
 from typing import TYPE_CHECKING
+import gc
 import os
 import tempfile
 import threading
@@ -9,7 +10,10 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from src.mental_health_coach.voice.conversation_manager import VoiceConversationManager
+from src.mental_health_coach.voice.conversation_manager import (
+    VoiceConversationManager,
+    _LocalAgreement,
+)
 
 if TYPE_CHECKING:
     from _pytest.capture import CaptureFixture
@@ -102,46 +106,82 @@ def test_voice_conversation_manager_listening(voice_config: dict) -> None:
     transcription_callback = MagicMock()
     manager.set_on_transcription_complete(transcription_callback)
     
-    # Mock the recorder's is_recording method to always return True
-    # when called from the manager's start_listening method
-    original_is_recording = manager.recorder.is_recording
-    
-    def patched_is_recording() -> bool:
-        """Patched is_recording method."""
-        if threading.current_thread() == manager._recording_thread:
-            # In the recording thread, return True first, then False to stop the loop
-            if not hasattr(manager.recorder, "_called_once"):
-                manager.recorder._called_once = True
-                return True
-            return False
-        # For the test thread assertions
-        return manager.recorder._recording
-    
-    manager.recorder.is_recording = patched_is_recording
-    
     # Start listening
     manager.start_listening()
     
-    # Wait a moment for the recording thread to start
+    # Wait a moment for the recording task to start
     time.sleep(0.1)
     
-    # Manually set the recording state for the test assertion
-    manager.recorder._recording = True
-    
     # Assert recording is active
     assert manager.recorder.is_recording()
     
-    # Wait for the recording thread to complete
-    if manager._recording_thread:
-        manager._recording_thread.join(timeout=1.0)
+    # Stopping wakes the recording task, which transcribes before returning
+    manager.stop_listening()
     
-    # The callback should have been called once the thread completed
+    # The callback should have been called once the task completed
     transcription_callback.assert_called_once()
     
     # Clean up
     manager.cleanup()
 
 
+def test_voice_conversation_manager_partial_transcription(voice_config: dict) -> None:
+    """Test that partial transcripts are streamed while recording.
+    
+    Args:
+        voice_config: Test configuration for the voice conversation manager.
+    """
+    voice_config["chunk_duration"] = 0.01
+    manager = VoiceConversationManager(voice_config)
+    
+    partials = []
+    manager.set_on_partial_transcription(partials.append)
+    
+    manager.start_listening()
+    time.sleep(0.2)
+    manager.stop_listening()
+    
+    # The mock engine repeats the same hypothesis, so it is committed exactly once
+    assert partials == ["Mock streaming transcription result."]
+    
+    manager.cleanup()
+
+
+def test_voice_conversation_manager_async_callback(voice_config: dict) -> None:
+    """Test that coroutine callbacks are awaited on the shared event loop.
+    
+    Args:
+        voice_config: Test configuration for the voice conversation manager.
+    """
+    manager = VoiceConversationManager(voice_config)
+    
+    transcriptions = []
+    
+    async def on_transcription(text: str) -> None:
+        """Record the transcription."""
+        transcriptions.append(text)
+    
+    manager.set_on_transcription_complete(on_transcription)
+    
+    manager.start_listening()
+    manager.stop_listening()
+    
+    assert transcriptions == ["This is a mock transcription for testing purposes."]
+    
+    manager.cleanup()
+
+
+def test_local_agreement_commits_agreed_prefix() -> None:
+    """Test that LocalAgreement-2 only emits words two hypotheses agree on."""
+    agreement = _LocalAgreement()
+    
+    assert agreement.update("I feel") == ""
+    assert agreement.update("I feel a bit") == "I feel"
+    assert agreement.update("I feel a bit anxious") == "a bit"
+    assert agreement.update("I feel a bit anxious today") == "anxious"
+    assert agreement.committed == ["I", "feel", "a", "bit", "anxious"]
+
+
 def test_voice_conversation_manager_speaking(voice_config: dict) -> None:
     """Test the speaking functionality of the voice conversation manager.
     
@@ -177,6 +217,25 @@ def test_voice_conversation_manager_speaking(voice_config: dict) -> None:
     manager.cleanup()
 
 
+def test_voice_conversation_manager_speech_complete(voice_config: dict) -> None:
+    """Test that finishing playback triggers the speech-complete callback.
+    
+    Args:
+        voice_config: Test configuration for the voice conversation manager.
+    """
+    manager = VoiceConversationManager(voice_config)
+    
+    speech_done = threading.Event()
+    manager.set_on_speech_complete(speech_done.set)
+    
+    manager.speak_response("This is a test response.")
+    
+    # The mock player finishes after 0.5 seconds and signals the manager
+    assert speech_done.wait(timeout=2.0)
+    
+    manager.cleanup()
+
+
 def test_voice_conversation_manager_stop_speaking(voice_config: dict) -> None:
     """Test stopping speech in the voice conversation manager.
     
@@ -195,4 +254,43 @@ def test_voice_conversation_manager_stop_speaking(voice_config: dict) -> None:
         pytest.fail(f"stop_speaking raised an exception: {e}")
     
     # Clean up
-    manager.cleanup() 
\ No newline at end of file
+    manager.cleanup() 
+
+
+def test_voice_conversation_manager_temp_dir_removed_on_gc(voice_config: dict) -> None:
+    """Test that a manager's temp directory is removed even without cleanup().
+    
+    Args:
+        voice_config: Test configuration for the voice conversation manager.
+    """
+    manager = VoiceConversationManager(voice_config)
+    temp_dir = manager.temp_dir
+    assert os.path.isdir(temp_dir)
+    
+    del manager
+    gc.collect()
+    
+    assert not os.path.exists(temp_dir)
+
+
+def test_voice_conversation_manager_engines_released_on_gc(voice_config: dict) -> None:
+    """Test that a manager's shared engines are released even without cleanup().
+    
+    Args:
+        voice_config: Test configuration for the voice conversation manager.
+    """
+    from src.mental_health_coach.voice.speech_to_text import SpeechToTextFactory
+    
+    manager = VoiceConversationManager(voice_config)
+    engine = manager.stt_engine
+    batcher = manager._stt_batcher
+    
+    del manager
+    gc.collect()
+    
+    # The batcher gives its engine back once its worker stops
+    batcher._worker.join(timeout=2.0)
+    
+    fresh = SpeechToTextFactory.get_shared_engine("mock", voice_config["stt_config"])
+    assert fresh is not engine
+    SpeechToTextFactory.release_engine(fresh)
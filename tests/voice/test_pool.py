@@ -0,0 +1,32 @@
+"""Tests for the PCM buffer pool."""
+
+from src.mental_health_coach.voice._pool import BufferPool
+
+
+def test_buffer_pool_reuses_released_buffers() -> None:
+    """Test that a released buffer is handed out again for the same tier."""
+    pool = BufferPool(tiers=(1024, 4096))
+    
+    with pool.acquire(100) as first:
+        assert len(first) == 100
+        first.view[:3] = b"abc"
+        underlying = first._buffer
+    
+    second = pool.acquire(1000)
+    assert second._buffer is underlying
+    assert len(second._buffer) == 1024
+    second.close()
+    
+    # Closing twice is harmless
+    second.close()
+
+
+def test_buffer_pool_oversized_requests_are_not_pooled() -> None:
+    """Test that requests larger than every tier are allocated directly."""
+    pool = BufferPool(tiers=(1024,))
+    
+    with pool.acquire(5000) as buffer:
+        assert len(buffer) == 5000
+        oversized = buffer._buffer
+    
+    assert pool.acquire(5000)._buffer is not oversized
@@ -5,9 +5,15 @@ import io
 
 import pytest
 
+from src.mental_health_coach.voice._batcher import (
+    MicroBatchingSTT,
+    acquire_batcher,
+    release_batcher,
+)
 from src.mental_health_coach.voice.speech_to_text import (
     SpeechToTextFactory,
     MockSpeechToTextEngine,
+    RollingAudioBuffer,
 )
 
 if TYPE_CHECKING:
@@ -34,21 +40,21 @@ def test_mock_speech_to_text_engine() -> None:
     assert len(transcription) > 0
     
     # Test streaming
-    engine.start_streaming()
+    stream = engine.start_streaming()
     
     # Test processing a small chunk (should return None)
     small_chunk = b"small"
-    result = engine.process_audio_chunk(small_chunk)
+    result = stream.process_audio_chunk(small_chunk)
     assert result is None
     
     # Test processing a large chunk (should return a transcription)
     large_chunk = b"x" * 1001  # More than 1000 bytes
-    result = engine.process_audio_chunk(large_chunk)
+    result = stream.process_audio_chunk(large_chunk)
     assert isinstance(result, str)
     assert len(result) > 0
     
     # Test stopping streaming
-    engine.stop_streaming()
+    stream.close()
 
 
 def test_speech_to_text_factory() -> None:
@@ -61,4 +67,112 @@ def test_speech_to_text_factory() -> None:
     
     # Test creating an unsupported engine
     with pytest.raises(ValueError):
-        SpeechToTextFactory.create_engine("unsupported", config) 
\ No newline at end of file
+        SpeechToTextFactory.create_engine("unsupported", config)
+
+
+def test_rolling_audio_buffer_is_bounded() -> None:
+    """Test that the rolling buffer drops the oldest audio beyond its budget."""
+    # One second of 16-bit audio at 1 kHz is 2000 bytes
+    buffer = RollingAudioBuffer(sample_rate=1000, max_seconds=1.0)
+    
+    buffer.append(b"a" * 1500)
+    buffer.append(b"b" * 1500)
+    
+    assert len(buffer) == 2000
+    assert buffer.window_bytes() == b"a" * 500 + b"b" * 1500
+    assert buffer.start_time == 0.5
+    assert buffer.end_time == 1.5
+
+
+def test_rolling_audio_buffer_window_view() -> None:
+    """Test that the pooled window matches the buffered audio and is released."""
+    buffer = RollingAudioBuffer(sample_rate=1000, max_seconds=1.0)
+    buffer.append(b"a" * 1500)
+    buffer.append(b"b" * 1500)
+    
+    with buffer.window_view() as window:
+        assert bytes(window) == buffer.window_bytes()
+    
+    with pytest.raises(ValueError):
+        bytes(window)
+
+
+def test_rolling_audio_buffer_trims_confirmed_audio() -> None:
+    """Test that confirming a position drops the audio before it."""
+    engine = MockSpeechToTextEngine({"sample_rate": 1000})
+    stream = engine.start_streaming()
+    
+    stream.process_audio_chunk(b"x" * 1200)
+    stream.process_audio_chunk(b"y" * 1200)
+    stream.confirm(0.5)
+    
+    assert stream.audio_buffer.window_bytes() == b"x" * 200 + b"y" * 1200
+    assert stream.audio_buffer.start_time == 0.5
+    
+    # Confirming an earlier position is a no-op
+    stream.confirm(0.25)
+    assert len(stream.audio_buffer) == 1400
+    
+    stream.close()
+    assert len(stream.audio_buffer) == 0
+
+
+def test_speech_to_text_factory_shares_engines() -> None:
+    """Test that one engine is shared while its streams stay independent."""
+    first = SpeechToTextFactory.get_shared_engine("mock", {"sample_rate": 16000})
+    second = SpeechToTextFactory.get_shared_engine("mock", {"sample_rate": 16000})
+    assert first is second
+    
+    first_stream = first.start_streaming()
+    second_stream = second.start_streaming()
+    first_stream.process_audio_chunk(b"x" * 100)
+    assert len(first_stream.audio_buffer) == 100
+    assert len(second_stream.audio_buffer) == 0
+    
+    first_stream.close()
+    second_stream.close()
+    SpeechToTextFactory.release_engine(first)
+    SpeechToTextFactory.release_engine(second)
+
+
+def test_acquire_batcher_reuses_shared_engine() -> None:
+    """Test that the batcher wraps the factory's cached engine."""
+    config = {"sample_rate": 8000}
+    engine = SpeechToTextFactory.get_shared_engine("mock", config)
+    batcher = acquire_batcher("mock", config)
+    assert batcher.engine is engine
+    
+    release_batcher(batcher)
+    batcher._worker.join(timeout=2.0)
+    
+    # The batcher's reference is gone, so the last release evicts the engine
+    SpeechToTextFactory.release_engine(engine)
+    fresh = SpeechToTextFactory.get_shared_engine("mock", config)
+    assert fresh is not engine
+    SpeechToTextFactory.release_engine(fresh)
+
+
+def test_micro_batching_stt_coalesces_requests() -> None:
+    """Test that requests queued together are transcribed in one batch."""
+    engine = MockSpeechToTextEngine({})
+    batches = []
+    
+    def transcribe_batch(audio_files):
+        batches.append(len(audio_files))
+        return [audio_file.read().decode() for audio_file in audio_files]
+    
+    engine.transcribe_batch = transcribe_batch
+    batcher = MicroBatchingSTT(engine, max_batch=8, max_delay=0.2)
+    
+    futures = [batcher.transcribe_async(io.BytesIO(f"clip {i}".encode())) for i in range(3)]
+    
+    assert [future.result(timeout=2.0) for future in futures] == ["clip 0", "clip 1", "clip 2"]
+    assert batches == [3]
+    
+    batcher.close()
+
+
+def test_faster_whisper_rejects_unsupported_quantization() -> None:
+    """Test that an unknown quantization is rejected before loading a model."""
+    with pytest.raises(ValueError):
+        SpeechToTextFactory.create_engine("faster_whisper", {"quantization": "int4"})
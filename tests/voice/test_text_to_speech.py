@@ -9,6 +9,7 @@ import pytest
 from src.mental_health_coach.voice.text_to_speech import (
     TextToSpeechFactory,
     MockTextToSpeechEngine,
+    register_engine,
 )
 
 if TYPE_CHECKING:
@@ -56,6 +57,16 @@ def test_mock_text_to_speech_engine() -> None:
     engine.set_voice("voice2")
 
 
+def test_mock_text_to_speech_stream() -> None:
+    """Test that the mock engine streams one chunk per sentence."""
+    engine = MockTextToSpeechEngine({})
+    
+    chunks = list(engine.synthesize_speech_stream("First sentence. Second one! Third?"))
+    
+    assert len(chunks) == 3
+    assert all(isinstance(chunk, bytes) for chunk in chunks)
+
+
 def test_text_to_speech_factory() -> None:
     """Test the text-to-speech factory."""
     # Test creating a mock engine
@@ -66,4 +77,36 @@ def test_text_to_speech_factory() -> None:
     
     # Test creating an unsupported engine
     with pytest.raises(ValueError):
-        TextToSpeechFactory.create_engine("unsupported", config) 
\ No newline at end of file
+        TextToSpeechFactory.create_engine("unsupported", config) 
+
+def test_text_to_speech_factory_shares_engines() -> None:
+    """Test that shared engines are reused until their last user releases them."""
+    config = {"voice": "shared-voice"}
+    first = TextToSpeechFactory.get_shared_engine("mock", config)
+    second = TextToSpeechFactory.get_shared_engine("mock", dict(config))
+    assert first is second
+    
+    # A different configuration gets its own engine
+    other = TextToSpeechFactory.get_shared_engine("mock", {"voice": "other-voice"})
+    assert other is not first
+    TextToSpeechFactory.release_engine(other)
+    
+    TextToSpeechFactory.release_engine(first)
+    assert TextToSpeechFactory.get_shared_engine("mock", config) is first
+    TextToSpeechFactory.release_engine(first)
+    TextToSpeechFactory.release_engine(first)
+    
+    # Once every user has released it, a new engine is created
+    fresh = TextToSpeechFactory.get_shared_engine("mock", config)
+    assert fresh is not first
+    TextToSpeechFactory.release_engine(fresh)
+
+
+def test_text_to_speech_register_engine() -> None:
+    """Test that engines registered with the decorator can be created by name."""
+    @register_engine("custom-test")
+    class CustomEngine(MockTextToSpeechEngine):
+        pass
+    
+    engine = TextToSpeechFactory.create_engine("custom-test", {})
+    assert isinstance(engine, CustomEngine)